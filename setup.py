@@ -57,6 +57,7 @@ setup(
             "plone.app.contenttypes",
             "plone.app.multilingual",
             "plone.app.robotframework[debug]",
+            "ZEO",
         ]
     },
     entry_points="""
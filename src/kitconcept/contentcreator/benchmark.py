@@ -0,0 +1,181 @@
+"""Benchmarks of content_creator_from_folder on synthetic content trees."""
+from .creator import content_creator_from_folder
+from dataclasses import asdict
+from dataclasses import dataclass
+from kitconcept import api
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import json
+import pathlib
+import time
+import tracemalloc
+
+
+@dataclass
+class Scenario:
+    """Shape of a synthetic content tree.
+
+    Each folder down to ``depth`` levels has ``breadth`` subfolders and
+    ``breadth`` documents with ``blocks`` text blocks each. ``images`` image
+    items with a dummy image, and ``translations`` translated documents
+    (in a second language root folder), are added below the root.
+    """
+
+    name: str
+    breadth: int = 3
+    depth: int = 2
+    blocks: int = 2
+    images: int = 0
+    translations: int = 0
+
+
+SCENARIOS = [
+    Scenario("small"),
+    Scenario("wide", breadth=50, depth=1),
+    Scenario("deep", breadth=2, depth=6),
+    Scenario("blocks", breadth=20, depth=1, blocks=100),
+    Scenario("images", breadth=2, depth=1, images=50),
+    Scenario("translations", breadth=3, depth=1, translations=50),
+]
+
+
+def make_document(id_: str, blocks: int) -> dict:
+    ids = [f"{id_}-block-{index}" for index in range(blocks)]
+    return {
+        "@type": "Document",
+        "id": id_,
+        "title": id_.replace("-", " ").capitalize(),
+        "blocks": {
+            block_id: {
+                "@type": "slate",
+                "plaintext": f"Text of {block_id}",
+                "value": [{"type": "p", "children": [{"text": f"Text of {block_id}"}]}],
+            }
+            for block_id in ids
+        },
+        "blocks_layout": {"items": ids},
+    }
+
+
+def make_folder(id_: str, scenario: Scenario, depth: int) -> dict:
+    items = [
+        make_document(f"{id_}-doc-{index}", scenario.blocks)
+        for index in range(scenario.breadth)
+    ]
+    if depth < scenario.depth:
+        items += [
+            make_folder(f"{id_}-{index}", scenario, depth + 1)
+            for index in range(scenario.breadth)
+        ]
+    return {"@type": "Folder", "id": id_, "title": id_, "items": items}
+
+
+def count_items(structure: List[dict]) -> int:
+    return sum(1 + count_items(data.get("items", [])) for data in structure)
+
+
+def generate_folder(path, scenario: Scenario) -> int:
+    """Write the content folder of ``scenario`` to ``path``.
+
+    :returns: The number of items to be created.
+    """
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    root = make_folder(scenario.name, scenario, 1)
+    root["items"] += [
+        {
+            "@type": "Image",
+            "id": f"image-{index}",
+            "title": f"Image {index}",
+            "set_dummy_image": {"image": "800x600"},
+        }
+        for index in range(scenario.images)
+    ]
+    structure = [root]
+    if scenario.translations:
+        root["id"] = "de"
+        translated = {"@type": "Folder", "id": "en", "title": "en", "items": []}
+        structure.append(translated)
+        lines = ["canonical,translation"]
+        for index in range(scenario.translations):
+            id_ = f"page-{index}"
+            root["items"].append(make_document(id_, scenario.blocks))
+            translated["items"].append(make_document(id_, scenario.blocks))
+            lines.append(f"/de/{id_},/en/{id_}")
+        (path / "translations.csv").write_text("\n".join(lines) + "\n")
+    with (path / "content.json").open("w") as f:
+        json.dump(structure, f)
+    return count_items(structure)
+
+
+def run_scenario(scenario: Scenario, path, **kwargs) -> dict:
+    """Import a generated folder and measure its throughput and memory.
+
+    The peak memory is the one of the Python allocations (tracemalloc)
+    during the import, which slows it down a bit.
+
+    :returns: A mapping with ``objects``, ``seconds``, ``objects_per_second``
+              and ``peak_memory`` (bytes).
+    """
+    objects = generate_folder(path, scenario)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=str(path), **kwargs)
+        seconds = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return dict(
+        scenario=asdict(scenario),
+        objects=objects,
+        seconds=round(seconds, 3),
+        objects_per_second=round(objects / seconds, 1),
+        peak_memory=peak,
+    )
+
+
+def load_baselines(path) -> Dict[str, dict]:
+    path = pathlib.Path(path)
+    if not path.exists():
+        return {}
+    with path.open() as f:
+        return json.load(f)
+
+
+def write_baselines(path, results: Dict[str, dict]):
+    with pathlib.Path(path).open("w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def check_regression(
+    result: dict, baseline: Optional[dict], tolerance: float = 0.25
+) -> List[str]:
+    """Compare a result with its baseline.
+
+    :returns: The regressions, if the throughput dropped or the peak memory
+              grew by more than ``tolerance`` (a fraction of the baseline).
+    """
+    if not baseline or baseline.get("scenario") != result["scenario"]:
+        # Unknown or changed scenario, nothing to compare with
+        return []
+    regressions = []
+    minimum = baseline["objects_per_second"] * (1 - tolerance)
+    if result["objects_per_second"] < minimum:
+        regressions.append(
+            "{} objects/s instead of {}".format(
+                result["objects_per_second"], baseline["objects_per_second"]
+            )
+        )
+    maximum = baseline["peak_memory"] * (1 + tolerance)
+    if result["peak_memory"] > maximum:
+        regressions.append(
+            "{} bytes peak memory instead of {}".format(
+                result["peak_memory"], baseline["peak_memory"]
+            )
+        )
+    return regressions
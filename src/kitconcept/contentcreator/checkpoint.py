@@ -0,0 +1,107 @@
+"""On-disk checkpoints of an import run, to resume it after a crash."""
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import json
+import os
+import pathlib
+import transaction
+
+
+class Checkpoint:
+    """Items of an import run which have been committed, kept in a file.
+
+    Items are marked with :meth:`mark` once they have been created. The marks
+    of a transaction are written to the file when it is committed, so the
+    file only ever lists committed items. If the run crashes (e.g. on a
+    ``ConflictError`` or a bad item), the next run with the same file skips
+    them and continues after the last commit.
+
+    The image fields waiting for their scales and the items waiting for the
+    refresh of their links are saved as well, since a resumed run does not
+    create their objects again. Once a run is complete
+    (see :meth:`finish`), the next one starts from scratch.
+
+    :param path: The checkpoint file, it is read if it exists.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.complete = False
+        self.scales: List[Tuple[str, str]] = []
+        self.scale_queue = None
+        self.linked_paths: List[str] = []
+        self._linked_paths: Optional[List[str]] = None
+        self._committed: Set[str] = set()
+        self._pending: Set[str] = set()
+        self._txn = None
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            if not data.get("complete"):
+                self._committed = set(data.get("done", []))
+                self.scales = [tuple(entry) for entry in data.get("scales", [])]
+                self.linked_paths = data.get("linked_paths", [])
+        # Whether a previous, incomplete run is being resumed
+        self.resumed = bool(self._committed)
+
+    def __len__(self):
+        return len(self._committed)
+
+    def is_done(self, key: str) -> bool:
+        """Whether ``key`` has been committed by a previous run."""
+        return key in self._committed
+
+    def mark(self, key: str):
+        """Mark ``key`` as done once the current transaction is committed."""
+        self._join()
+        self._pending.add(key)
+
+    def attach(self, scale_queue, linked_paths: Optional[List[str]] = None):
+        """Resume the scales of ``scale_queue`` and the ``linked_paths`` to
+        refresh (see :class:`kitconcept.contentcreator.context.ImportContext`),
+        and save them at each commit.
+        """
+        if scale_queue.enabled:
+            scale_queue.pending[:0] = self.scales
+        self.scale_queue = scale_queue
+        if linked_paths is not None:
+            linked_paths[:0] = self.linked_paths
+            self._linked_paths = linked_paths
+
+    def finish(self):
+        """Record that the run is complete, the next one starts over."""
+        self.complete = True
+        self.save()
+
+    def save(self):
+        if self.scale_queue is not None:
+            self.scales = list(self.scale_queue.pending)
+        if self._linked_paths is not None:
+            self.linked_paths = list(dict.fromkeys(self._linked_paths))
+        data = {
+            "complete": self.complete,
+            "done": sorted(self._committed),
+            "scales": self.scales,
+            "linked_paths": self.linked_paths,
+        }
+        # Replace the file atomically, a crash must not leave half of it
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(json.dumps(data, indent=2))
+        os.replace(temporary, self.path)
+
+    def _join(self):
+        txn = transaction.get()
+        if txn is not self._txn:
+            # The previous transaction was aborted, its hook never ran
+            self._pending = set()
+            self._txn = txn
+            txn.addAfterCommitHook(self._after_commit)
+
+    def _after_commit(self, success):
+        if success:
+            self._committed |= self._pending
+            self.save()
+        self._pending = set()
+        self._txn = None
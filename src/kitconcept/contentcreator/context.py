@@ -0,0 +1,79 @@
+"""State shared by the runner calls of an import run."""
+from .ids import IdResolver
+from .images import BlobRegistry
+from .indexing import IndexingQueue
+from .links import UIDMap
+from .lookup import ContentLookup
+from functools import cached_property
+from kitconcept import api
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+class ImportContext:
+    """Services and site-wide facts of an import run.
+
+    The site-wide facts (supported languages, whether
+    ``plone.app.multilingual`` is installed) are looked up once per run, and
+    the language of a container once per container, instead of for every
+    item. ``create_item_runner`` passes the context through its recursion.
+    """
+
+    def __init__(
+        self,
+        portal=None,
+        blob_registry: Optional[BlobRegistry] = None,
+        lookup: Optional[ContentLookup] = None,
+        id_resolver: Optional[IdResolver] = None,
+        indexing_queue: Optional[IndexingQueue] = None,
+    ):
+        self.portal = portal if portal is not None else api.portal.get()
+        if blob_registry is None:
+            blob_registry = BlobRegistry()
+        if lookup is None:
+            lookup = ContentLookup(self.portal)
+        if id_resolver is None:
+            id_resolver = IdResolver()
+        if indexing_queue is None:
+            indexing_queue = IndexingQueue()
+        self.blob_registry = blob_registry
+        self.lookup = lookup
+        self.id_resolver = id_resolver
+        self.indexing_queue = indexing_queue
+        self._languages: Dict[str, Optional[str]] = {}
+        # UIDs of the items of the run, if they have been scanned up front
+        self.uid_map: Optional[UIDMap] = None
+        # Physical paths of the items with links the UID map did not resolve
+        self.linked_paths: List[str] = []
+        # Errors of the items the runner could not create or edit, also the
+        # ones swallowed with CREATOR_CONTINUE_ON_ERROR
+        self.errors: List[str] = []
+
+    @cached_property
+    def portal_url(self) -> str:
+        return self.portal.absolute_url()
+
+    @cached_property
+    def supported_languages(self) -> Tuple[str, ...]:
+        language_tool = api.portal.get_tool("portal_languages")
+        return tuple(language_tool.getSupportedLanguages())
+
+    @cached_property
+    def multilingual(self) -> bool:
+        """Whether plone.app.multilingual is installed with 2+ languages."""
+        return len(
+            self.supported_languages
+        ) > 1 and "plone.app.multilingual" in api.addon.get_addons_ids("installed")
+
+    def get_language(self, container) -> Optional[str]:
+        """Return the language of the language root folder of ``container``."""
+        path = container.getPhysicalPath()
+        key = "/".join(path)
+        if key not in self._languages:
+            self._languages[key] = next(
+                (segment for segment in path if segment in self.supported_languages),
+                None,
+            )
+        return self._languages[key]
@@ -1,15 +1,37 @@
+from .checkpoint import Checkpoint
+from .context import ImportContext
+from .ids import IdResolver
+from .images import get_blob_size
 from .images import process_local_images
-from .scales import plone_scale_generate_on_save
+from .indexing import IndexingQueue
+from .links import has_internal_links
+from .links import UIDMap
+from .lookup import ContentLookup
+from .manifest import ImportManifest
+from .plan import ImportPlan
+from .plan import rolled_back
+from .preload import preload
+from .profiling import profile_import
+from .profiling import profile_phase
+from .scales import ScaleQueue
+from .scheduler import Item
+from .scheduler import schedule
+from .scheduler import WorkUnit
+from .timing import measure
+from .timing import Timings
+from .transactions import CommitPolicy
+from .transactions import Committer
 from .translations import link_translations
 from .utils import handle_error
 from .utils import logger
 from Acquisition import aq_base
 from Acquisition.interfaces import IAcquirer
+from contextlib import nullcontext
 from dataclasses import dataclass
+from dataclasses import field
 from DateTime import DateTime
 from importlib import import_module
 from kitconcept import api
-from plone.app.content.interfaces import INameFromTitle
 from plone.app.dexterity import behaviors
 from plone.dexterity.utils import iterSchemata
 from plone.restapi.behaviors import IBlocks
@@ -20,13 +42,12 @@ from plone.restapi.services.content.utils import create
 from Products.CMFCore.utils import getToolByName
 from Products.CMFPlone.interfaces.constrains import ISelectableConstrainTypes
 from Products.CMFPlone.utils import safe_hasattr
-from sys import maxsize
+from typing import List
 from typing import Optional
 from typing import Union
 from zExceptions import NotFound
 from zope.component import getMultiAdapter
 from zope.component import queryMultiAdapter
-from zope.container.interfaces import INameChooser
 from zope.event import notify
 from zope.globalrequest import getRequest
 from zope.lifecycleevent import Attributes
@@ -78,7 +99,59 @@ def load_json(path: Pathlike, base_path: Optional[Pathlike] = None):
     return json.loads(path.read_text())
 
 
-def set_exclude_from_nav(obj):
+def iter_json(path: Pathlike, chunk_size: int = 1024 * 1024):
+    """Iterate over the items of a JSON array in a file, one at a time.
+
+    The file is read in chunks and only the item being decoded is kept in
+    memory, so this also works for very large ``content.json`` files.
+
+    :param path: Path to a JSON file containing an array.
+    :type path: string or pathlib.Path
+    :param chunk_size: Number of characters to read at once.
+    :type chunk_size: int
+    :returns: Iterator over the decoded items of the array.
+    """
+    decoder = json.JSONDecoder()
+    whitespace = " \t\n\r"
+    with open(path) as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+        pos = len(buffer) - len(buffer.lstrip(whitespace))
+        if buffer[pos : pos + 1] != "[":
+            # Not an array, there is nothing to stream
+            yield from json.loads(buffer + f.read())
+            return
+        pos += 1
+        read_size = chunk_size
+        while True:
+            while pos < len(buffer) and buffer[pos] in whitespace + ",":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                if pos == len(buffer):
+                    raise json.JSONDecodeError("Incomplete item", buffer, pos)
+                item, end = decoder.raw_decode(buffer, pos)
+                if end == len(buffer) and not eof:
+                    # e.g. a number might continue in the next chunk
+                    raise json.JSONDecodeError("Incomplete item", buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The read size doubles while an item is incomplete, so a
+                # large item is only decoded a logarithmic number of times
+                chunk = f.read(read_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                read_size *= 2
+                continue
+            yield item
+            pos = end
+            read_size = chunk_size
+
+
+def set_exclude_from_nav(obj, indexing_queue: Optional[IndexingQueue] = None):
     """Set image field in object on both, Archetypes and Dexterity."""
     try:
         obj.setExcludeFromNav(True)  # Archetypes
@@ -86,7 +159,10 @@ def set_exclude_from_nav(obj):
         # Dexterity
         obj.exclude_from_nav = True
     finally:
-        obj.reindexObject(idxs=["exclude_from_nav"])
+        if indexing_queue is not None:
+            indexing_queue.reindex(obj, ["exclude_from_nav"])
+        else:
+            obj.reindexObject(idxs=["exclude_from_nav"])
 
 
 def disable_content_type(portal, fti_id):
@@ -107,9 +183,12 @@ def get_lang_from_lrf(container, langs):
             return segment
 
 
-def create_object(path, is_folder=False):
+def create_object(path, is_folder=False, lookup: Optional[ContentLookup] = None):
     """Recursively create object and folder structure if necessary"""
-    obj = api.content.get(path=path)
+    if lookup is not None:
+        obj = lookup.get(path)
+    else:
+        obj = api.content.get(path=path)
     if obj is not None:
         return obj
 
@@ -117,38 +196,22 @@ def create_object(path, is_folder=False):
     if path_parent == "":
         parent = api.portal.get()
     else:
-        parent = create_object(path_parent, is_folder=True)
+        parent = create_object(path_parent, is_folder=True, lookup=lookup)
 
     type_ = "Folder" if is_folder else "Document"
     obj = api.content.create(container=parent, type=type_, id=obj_id)
     api.content.transition(obj=obj, transition="publish")
+    if lookup is not None:
+        lookup.register(obj)
     path = "/".join(obj.getPhysicalPath())
     logger.info(f"{path} - created {type_}")
     return obj
 
 
-def guess_id(data, container):
-    type_ = data.get("@type", None)
-    id_ = data.get("id", None)
-    title = data.get("title", None)
-
-    obj = create(container, type_, id_=id_, title=title)
-    chooser = INameChooser(container)
-    # INameFromTitle adaptable objects should not get a name
-    # suggestion. NameChooser would prefer the given name instead of
-    # the one provided by the INameFromTitle adapter.
-    suggestion = None
-    name_from_title = INameFromTitle(obj, None)
-    if name_from_title is None:
-        suggestion = obj.Title()
-    id_ = chooser.chooseName(suggestion, obj)
-
-    # Case 1: Content exists and the chooser has answered an id_ ending in "-1"
-    if container.get(id_[:-2], False):
-        return id_[:-2]
-    # Case 2: Content does not exits and the chooser has guessed the correct id
-    else:
-        return id_
+def guess_id(data, container, id_resolver: Optional[IdResolver] = None):
+    if id_resolver is None:
+        id_resolver = IdResolver()
+    return id_resolver.resolve(data, container)
 
 
 def create_item_runner(  # noqa
@@ -160,6 +223,11 @@ def create_item_runner(  # noqa
     ignore_wf_types=["Image", "File"],
     logger=logger,
     do_not_edit_if_modified_after=None,
+    commit_policy: Optional[CommitPolicy] = None,
+    committer: Optional[Committer] = None,
+    scale_queue: Optional[ScaleQueue] = None,
+    created_paths: Optional[list] = None,
+    import_context: Optional[ImportContext] = None,
 ):
     """Create Dexterity contents from plone.restapi compatible structures.
 
@@ -176,6 +244,25 @@ def create_item_runner(  # noqa
     :type ignore_wf_types: list (default: ['Image', 'File'])
     :param logger: Logger to use.
     :type logger: Python logging instance.
+    :param commit_policy: Commit the transaction in batches while creating
+                          the content, instead of keeping everything in one
+                          transaction.
+    :type commit_policy: kitconcept.contentcreator.transactions.CommitPolicy
+    :param committer: Committer shared by several runner calls of the same
+                      import run. Takes precedence over ``commit_policy``.
+    :type committer: kitconcept.contentcreator.transactions.Committer
+    :param scale_queue: Queue collecting the image fields whose scales are
+                        generated after the content has been created. If not
+                        given, the scales are generated when the runner
+                        returns.
+    :type scale_queue: kitconcept.contentcreator.scales.ScaleQueue
+    :param created_paths: If given, the physical paths of the created and
+                          edited objects are appended to this list.
+    :type created_paths: list
+    :param import_context: Context shared by the runner calls of the same
+                           import run (blob registry, object lookup, id
+                           resolver and site-wide facts).
+    :type import_context: kitconcept.contentcreator.context.ImportContext
 
     The datastructure of content defined by plone.restapi:
 
@@ -203,18 +290,95 @@ def create_item_runner(  # noqa
     Use the same structure for each child. Leave out, what you don't need.
     """
 
+    owns_import_context = import_context is None
+    if owns_import_context:
+        import_context = ImportContext()
+
+    options = dict(
+        import_context=import_context,
+        created_paths=created_paths,
+        base_image_path=base_image_path,
+        default_lang=default_lang,
+        default_wf_state=default_wf_state,
+        ignore_wf_types=ignore_wf_types,
+        logger=logger,
+        do_not_edit_if_modified_after=do_not_edit_if_modified_after,
+    )
+
+    if owns_import_context:
+        create_item_runner(
+            container,
+            content_structure,
+            commit_policy=commit_policy,
+            committer=committer,
+            scale_queue=scale_queue,
+            **options,
+        )
+        import_context.indexing_queue.flush()
+        return
+
+    if scale_queue is None:
+        # Image scales are generated once all the content has been created
+        scale_queue = ScaleQueue()
+        create_item_runner(
+            container,
+            content_structure,
+            commit_policy=commit_policy,
+            committer=committer,
+            scale_queue=scale_queue,
+            **options,
+        )
+        scale_queue.process()
+        return
+
+    if committer is None and commit_policy is not None:
+        committer = Committer(commit_policy)
+        create_item_runner(
+            container,
+            content_structure,
+            committer=committer,
+            scale_queue=scale_queue,
+            **options,
+        )
+        committer.commit()
+        return
+
+    if committer is not None and not committer.running:
+        # Each top-level item is committed and retried on its own
+        container_path = "/".join(container.getPhysicalPath())
+        for data in content_structure:
+            committer.run(
+                create_item_runner,
+                container,
+                [data],
+                committer=committer,
+                scale_queue=scale_queue,
+                description="{}/{}".format(
+                    container_path, data.get("id") or data.get("title")
+                ),
+                **options,
+            )
+        return
+
     request = getRequest()
     portal = api.portal.get()
-
-    SKIP_SCALES = os.environ.get("CREATOR_SKIP_SCALES")
+    indexing_queue = import_context.indexing_queue
 
     for data in content_structure:
         type_ = data.get("@type", None)
         id_ = data.get("id", None)
         title = data.get("title", None)
+        has_links = False
+        if import_context.uid_map is not None and data.get("blocks"):
+            # Links to the items of the run, even to those created later
+            data["blocks"] = import_context.uid_map.resolve_links(data["blocks"])
+            # Links to other content created during the run (e.g. items
+            # without an id or title, or the containers of standalone files)
+            # are resolved by refreshing the item later
+            has_links = has_internal_links(data, import_context.portal_url)
 
         if id_ is None:
-            id_ = guess_id(data, container)
+            id_ = guess_id(data, container, id_resolver=import_context.id_resolver)
 
         if not type_:
             logger.warn("Property '@type' is required")
@@ -227,14 +391,19 @@ def create_item_runner(  # noqa
         else:
             # if don't we create it
             try:
-                obj = create(container, type_, id_=id_, title=title)
+                with measure("create", type_):
+                    obj = create(container, type_, id_=id_, title=title)
                 create_object = True
+                if data.get("UID"):
+                    # Set before the object is added (and the UUID handler
+                    # runs), so it is cataloged with this UID right away
+                    setattr(obj, "_plone.uuid", data.get("UID"))
             except Exception as e:  # noqa: B902
-                logger.error(
-                    "Can not create object {} ({}) in {}, because of {}".format(
-                        id_, type_, "/".join(container.getPhysicalPath()), e
-                    )
+                message = "Can not create object {} ({}) in {}, because of {}".format(
+                    id_, type_, "/".join(container.getPhysicalPath()), e
                 )
+                logger.error(message)
+                import_context.errors.append(message)
                 continue
         if (
             not create_object
@@ -260,22 +429,15 @@ def create_item_runner(  # noqa
 
             # default language
             if not data.get("language"):
-                language_tool = api.portal.get_tool("portal_languages")
-                supported_langs = language_tool.getSupportedLanguages()
-
                 if obj.portal_type == "LRF":
                     if not obj.language:
                         data["language"] = obj.id
                     else:
                         data["language"] = obj.language
-                elif (
-                    "plone.app.multilingual" in api.addon.get_addons_ids("installed")
-                    and len(supported_langs) > 1
-                    and not obj.language
-                ):
+                elif import_context.multilingual and not obj.language:
                     # If pam, supported langs are two or more, and obj has no language set
                     # get language from path and set it
-                    data["language"] = get_lang_from_lrf(container, supported_langs)
+                    data["language"] = import_context.get_language(container)
                 else:
                     # If object does not have already language, and default_lang is set
                     if not obj.language and default_lang:
@@ -296,9 +458,12 @@ def create_item_runner(  # noqa
                 obj.blocks_layout = DEFAULT_BLOCKS_LAYOUT
 
             # Populate image if any
-            image_fieldnames_added = process_local_images(data, obj, base_image_path)
+            image_fieldnames_added = process_local_images(
+                data, obj, base_image_path, blob_registry=import_context.blob_registry
+            )
 
-            deserializer(validate_all=True, data=data, create=True)
+            with measure("deserialize", type_):
+                deserializer(validate_all=True, data=data, create=True)
 
             if temporarily_wrapped:
                 obj = aq_base(obj)
@@ -307,39 +472,42 @@ def create_item_runner(  # noqa
 
             if create_object:
                 if not getattr(deserializer, "notifies_create", False):
-                    notify(ObjectCreatedEvent(obj))
-                obj = add(container, obj, rename=not bool(id_))
-                if not SKIP_SCALES:
-                    for image_fieldname in image_fieldnames_added:
-                        logger.debug(
-                            "{} - generating image scales for {} field".format(
-                                "/".join(obj.getPhysicalPath()), image_fieldname
-                            )
-                        )
-                        plone_scale_generate_on_save(obj, request, image_fieldname)
+                    with measure("events", type_):
+                        notify(ObjectCreatedEvent(obj))
+                with measure("add", type_):
+                    obj = add(container, obj, rename=not bool(id_))
+                for image_fieldname in image_fieldnames_added:
+                    scale_queue.enqueue(obj, image_fieldname)
             else:
                 if deserializer.modified:
                     descriptions = []
                     for interface, names in deserializer.modified.items():
                         descriptions.append(Attributes(interface, *names))
-                    notify(ObjectModifiedEvent(obj, *descriptions))
+                    with measure("events", type_):
+                        notify(ObjectModifiedEvent(obj, *descriptions))
 
-            # Set UUID - TODO: add to p.restapi
-            if data.get("UID"):
+            # Set UUID of existing objects - TODO: add to p.restapi
+            if (
+                not create_object
+                and data.get("UID")
+                and getattr(obj, "_plone.uuid", None) != data.get("UID")
+            ):
                 setattr(obj, "_plone.uuid", data.get("UID"))
-                obj.reindexObject(idxs=["UID"])
+                indexing_queue.reindex(obj, ["UID"])
 
             # Set workflow
             if (
                 data.get("review_state", False)
                 and obj.portal_type not in ignore_wf_types
             ):  # noqa
-                api.content.transition(obj=obj, to_state=data.get("review_state"))
+                with measure("workflow", type_):
+                    api.content.transition(obj=obj, to_state=data.get("review_state"))
                 if data.get("review_state") == "published" and not data.get(
                     "effective", False
                 ):
                     # Side-effect if review_state is published, always set the effective date
                     obj.effective_date = DateTime()
+                    indexing_queue.reindex(obj, ["effective", "effectiveRange"])
 
             # set additional defaults (from opts)
             opts = data.get("opts", {})
@@ -349,7 +517,7 @@ def create_item_runner(  # noqa
             if default_view:
                 obj.setLayout(default_view)
             if opts.get("exclude_from_nav", False):
-                set_exclude_from_nav(obj)
+                set_exclude_from_nav(obj, indexing_queue=indexing_queue)
 
             id_ = obj.id  # get the real id
             path = "/".join(obj.getPhysicalPath())
@@ -392,8 +560,17 @@ def create_item_runner(  # noqa
         except Exception as e:  # noqa: B902
             container_path = "/".join(container.getPhysicalPath())
             message = f'Could not edit the fields and properties for object {container_path}/{id_} (type: "{type_}", container: "{container_path}", id: "{id_}", title: "{title}") because: {e}'
+            import_context.errors.append(message)
             handle_error(message)
 
+        if committer is not None:
+            committer.add(obj, get_blob_size(obj, data))
+        if created_paths is not None:
+            created_paths.append("/".join(obj.getPhysicalPath()))
+        import_context.lookup.register(obj)
+        if has_links:
+            import_context.linked_paths.append("/".join(obj.getPhysicalPath()))
+
         # Call recursively
         create_item_runner(
             obj,
@@ -403,6 +580,10 @@ def create_item_runner(  # noqa
             ignore_wf_types=ignore_wf_types,
             logger=logger,
             base_image_path=base_image_path,
+            committer=committer,
+            scale_queue=scale_queue,
+            created_paths=created_paths,
+            import_context=import_context,
         )
 
 
@@ -421,7 +602,13 @@ def get_objects_created(container, content_structure):
         return paths
 
 
-def refresh_objects_created_by_structure(container, content_structure):
+def refresh_object(obj, committer: Optional[Committer] = None):
+    """Serialize and deserialize the blocks of ``obj`` again.
+
+    Links to content that did not exist yet when ``obj`` was created are
+    turned into resolveuid links this way.
+    """
+
     def deserialize(obj, blocks=None, validate_all=False):
         request = getRequest()
         request["BODY"] = json.dumps({"blocks": blocks})
@@ -440,28 +627,29 @@ def refresh_objects_created_by_structure(container, content_structure):
         serializer = getMultiAdapter((field, context, request), IFieldSerializer)
         return serializer()
 
-    def get_content_by_data(data, container):
-        type_ = data.get("@type", None)
-        id_ = data.get("id", None)
-        title = data.get("title", None)
+    if not IBlocks.providedBy(obj):
+        return
+    with measure("refresh", obj.portal_type):
+        blocks_serialized = serialize(obj)
+        deserialize(obj, blocks_serialized)
+    if committer is not None:
+        committer.add(obj)
 
-        obj = create(container, type_, id_=id_, title=title)
-        chooser = INameChooser(container)
-        # INameFromTitle adaptable objects should not get a name
-        # suggestion. NameChooser would prefer the given name instead of
-        # the one provided by the INameFromTitle adapter.
-        suggestion = None
-        name_from_title = INameFromTitle(obj, None)
-        if name_from_title is None:
-            suggestion = obj.Title()
-        id_ = chooser.chooseName(suggestion, obj)
-        original = id_[:-2]
-        return container.get(original, None)
+
+def refresh_objects_created_by_structure(
+    container,
+    content_structure,
+    committer: Optional[Committer] = None,
+    id_resolver: Optional[IdResolver] = None,
+):
+    if id_resolver is None:
+        id_resolver = IdResolver()
+    portal_url = api.portal.get().absolute_url()
 
     for data in content_structure:
         id_ = data.get("id", None)
         if not id_:
-            obj = get_content_by_data(data, container)
+            obj = container.get(id_resolver.resolve(data, container), None)
             if not obj:
                 logger.error(
                     "id can't be guessed for {0} in container {1}".format(
@@ -472,38 +660,30 @@ def refresh_objects_created_by_structure(container, content_structure):
         else:
             obj = container.get(id_, None)
 
-        if obj and IBlocks.providedBy(obj):
-            blocks_serialized = serialize(obj)
-            deserialize(obj, blocks_serialized)
-
         if obj:
+            if has_internal_links(data, portal_url):
+                refresh_object(obj, committer=committer)
             refresh_objects_created_by_structure(
-                obj, content_structure=data.get("items", [])
+                obj,
+                content_structure=data.get("items", []),
+                committer=committer,
+                id_resolver=id_resolver,
             )
 
 
-def refresh_objects_created_by_file(path: pathlib.Path):
-    def deserialize(obj, blocks=None, validate_all=False):
-        request = getRequest()
-        request["BODY"] = json.dumps({"blocks": blocks})
-        deserializer = getMultiAdapter((obj, request), IDeserializeFromJson)
-
-        return deserializer(validate_all=validate_all)
-
-    def serialize(context):
-        request = getRequest()
-        fieldname = "blocks"
-        for schema in iterSchemata(context):
-            if fieldname in schema:
-                field = schema.get(fieldname)
-                break
-
-        serializer = getMultiAdapter((field, context, request), IFieldSerializer)
-        return serializer()
-
+def refresh_objects_created_by_file(
+    path: pathlib.Path,
+    committer: Optional[Committer] = None,
+    lookup: Optional[ContentLookup] = None,
+):
     splitted_path = path.stem.split(".")
     plone_path = "/" + "/".join(splitted_path[:-1])
     id_ = splitted_path[-1]
+    if lookup is not None:
+        obj = lookup.get(f"{plone_path.rstrip('/')}/{id_}")
+        if obj is not None:
+            refresh_object(obj, committer=committer)
+        return
     try:
         container = api.content.get(path=plone_path)
     except NotFound:
@@ -511,15 +691,241 @@ def refresh_objects_created_by_file(path: pathlib.Path):
         return
 
     obj = container.get(id_, None)
-    if obj and IBlocks.providedBy(obj):
-        blocks_serialized = serialize(obj)
-        deserialize(obj, blocks_serialized)
+    if obj:
+        refresh_object(obj, committer=committer)
 
 
 @dataclass
-class Item:
-    path: pathlib.Path
-    structure: dict
+class FolderInputs:
+    """The files of a content folder, by their role in the import."""
+
+    siteroot: Optional[pathlib.Path] = None
+    content_json: Optional[pathlib.Path] = None
+    translations: Optional[pathlib.Path] = None
+    # The standalone JSON files
+    paths: List[pathlib.Path] = field(default_factory=list)
+
+
+def scan_folder(folder: pathlib.Path, exclude=()) -> FolderInputs:
+    inputs = FolderInputs()
+    for path in folder.iterdir():
+        # Skip explicitly excluded filenames and directories
+        if path.name.startswith(tuple(exclude)) or path.is_dir():
+            continue
+        if path.name == "content.json":
+            inputs.content_json = path
+        elif path.name == "siteroot.json":
+            inputs.siteroot = path
+        elif path.name == "translations.csv":
+            inputs.translations = path
+        else:
+            inputs.paths.append(path)
+    return inputs
+
+
+class ImportInputs:
+    """Decides which inputs of a folder import are skipped, and records them.
+
+    An input is the site root, a top-level entry of ``content.json``, a
+    standalone file or the translations. With a checkpoint, an input
+    committed by a previous run is skipped, with a manifest an input whose
+    digest did not change since the previous import. Imported inputs are
+    recorded in both, unless the runner had errors with them (e.g. swallowed
+    with ``CREATOR_CONTINUE_ON_ERROR``), so they are imported again next
+    time.
+
+    :param folder: The content folder, the inputs are recorded in the
+                   manifest by its resolved path and their key.
+    :param plan: The plan of a dry run, which lists the skipped inputs. A
+                 dry run records nothing.
+    """
+
+    def __init__(
+        self,
+        folder: pathlib.Path,
+        base_image_path,
+        import_context: ImportContext,
+        manifest: Optional[ImportManifest] = None,
+        plan: Optional[ImportPlan] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ):
+        self.prefix = str(folder.resolve())
+        self.base_image_path = base_image_path
+        self.errors = import_context.errors
+        self.manifest = manifest
+        self.plan = plan
+        self.checkpoint = checkpoint
+        # Number of inputs imported (or planned) so far
+        self.imported = 0
+        self._pending = {}
+
+    def should_skip(
+        self,
+        key: str,
+        path: str,
+        portal_type=None,
+        data=None,
+        file: Optional[pathlib.Path] = None,
+        exists=False,
+        changed=False,
+    ) -> bool:
+        """Return whether an input is skipped, the others must be recorded.
+
+        :param key: Identifies the input in the folder, e.g. its filename.
+        :param path: Path of the object of the input in the portal.
+        :param data: The JSON of the input, or the ``file`` it is read from.
+        :param exists: The input is only unchanged if its object exists.
+        :param changed: Import the input, whatever its digest.
+        """
+        if self.checkpoint is not None and self.checkpoint.is_done(key):
+            self.skip(path, "committed in a previous run", portal_type)
+            return True
+        digest = None
+        if self.manifest is not None:
+            if file is not None:
+                digest = self.manifest.get_file_digest(file)
+            else:
+                digest = self.manifest.get_digest(data, self.base_image_path)
+            if not changed and self.manifest.is_unchanged(
+                f"{self.prefix}/{key}", digest, path if exists else None
+            ):
+                self.skip(path, "unchanged", portal_type)
+                return True
+        self._pending[key] = (digest, len(self.errors))
+        return False
+
+    def skip(self, path: str, reason: str, portal_type=None):
+        logger.info(f"{path} - {reason}, skipped")
+        if self.plan is not None:
+            self.plan.skip(path, reason, portal_type)
+
+    def record(self, key: str) -> bool:
+        """Record an imported input, unless the runner had errors with it."""
+        digest, errors = self._pending.pop(key)
+        self.imported += 1
+        if len(self.errors) > errors:
+            logger.warning(f"{key} - imported with errors, not recorded")
+            return False
+        if digest is not None:
+            self.manifest.record(f"{self.prefix}/{key}", digest)
+        if self.checkpoint is not None and self.plan is None:
+            self.checkpoint.mark(key)
+        return True
+
+
+class FolderImport:
+    """The phases of an import of a content folder.
+
+    See :func:`content_creator_from_folder`, which creates it with the
+    services of the run. ``runner_options`` are passed to
+    :func:`create_item_runner`.
+
+    The phases hand the inputs which are not skipped to the ``add_*``
+    methods, which create the content. In a dry run, the ones of the
+    ``plan`` with the same names are called instead.
+    """
+
+    def __init__(
+        self,
+        inputs: ImportInputs,
+        import_context: ImportContext,
+        runner_options: dict,
+        committer: Optional[Committer] = None,
+        plan: Optional[ImportPlan] = None,
+    ):
+        self.inputs = inputs
+        self.import_context = import_context
+        self.runner_options = dict(
+            runner_options, committer=committer, import_context=import_context
+        )
+        self.committer = committer
+        self.actions = plan if plan is not None else self
+
+    def siteroot(self, path: pathlib.Path):
+        logger.debug("Site root info found, applying changes")
+        root_info = load_json(path)
+        if self.inputs.should_skip(path.name, "/", "Plone Site", data=root_info):
+            return
+        self.actions.add_siteroot(root_info)
+        self.inputs.record(path.name)
+
+    def content(self, path: pathlib.Path):
+        """Create the items of ``content.json``, streamed one by one."""
+        logger.debug("content.json file found, creating content")
+        for index, data in enumerate(iter_json(path)):
+            id_ = data.get("id", index)
+            key = f"{path.name}/{id_}"
+            if self.inputs.should_skip(
+                key,
+                f"/{id_}",
+                data.get("@type"),
+                data=data,
+                exists=True,
+                # Without an id, it's not known which object to look for
+                changed=not data.get("id"),
+            ):
+                continue
+            self.actions.add_structure(data, "/")
+            self.inputs.record(key)
+
+    def items(self, items: List[Item], custom_order=(), types_order=()):
+        """Create the standalone items, one subtree (work unit) at a time."""
+        units = schedule(items, custom_order=custom_order, types_order=types_order)
+        for unit in units:
+            if self.committer is not None:
+                self.committer.run(self.create_unit, unit, description=unit.root)
+            else:
+                self.create_unit(unit)
+
+    def create_unit(self, unit: WorkUnit):
+        for item in unit.items:
+            key = item.path.name
+            portal_type = item.structure.get("@type")
+            if self.inputs.should_skip(
+                key, item.plone_path, portal_type, data=item.structure, exists=True
+            ):
+                continue
+            self.actions.add_item(item)
+            self.inputs.record(key)
+
+    def translations(self, path: pathlib.Path):
+        # The imported objects are linked again, even if the file is unchanged
+        if self.inputs.should_skip(
+            path.name, path.name, file=path, changed=self.inputs.imported > 0
+        ):
+            return
+        self.actions.add_translations(path)
+        self.inputs.record(path.name)
+
+    def refresh(self):
+        """Refresh the items with links the UID map could not resolve."""
+        paths = dict.fromkeys(self.import_context.linked_paths)
+        if paths:
+            logger.debug("Refreshing the items with unresolved internal links...")
+        for path in paths:
+            obj = self.import_context.lookup.get(path)
+            if obj is not None:
+                refresh_object(obj, committer=self.committer)
+
+    def add_siteroot(self, root_info: dict):
+        modify_siteroot(root_info)
+
+    def add_structure(self, data: dict, container_path: str):
+        container = self.import_context.lookup.get(container_path)
+        self.import_context.uid_map.assign(data, container_path)
+        create_item_runner(container, [data], **self.runner_options)
+
+    def add_item(self, item: Item):
+        lookup = self.import_context.lookup
+        if lookup.get(item.container_path) is None:
+            create_object(item.container_path, is_folder=True, lookup=lookup)
+        if "id" not in item.structure:
+            item.structure["id"] = item.id
+        self.add_structure(item.structure, item.container_path)
+
+    def add_translations(self, path: pathlib.Path):
+        with measure("translations"), profile_phase("translations"):
+            link_translations(path, lookup=self.import_context.lookup)
 
 
 def content_creator_from_folder(
@@ -534,6 +940,14 @@ def content_creator_from_folder(
     custom_order=[],
     do_not_edit_if_modified_after=None,
     exclude=[],
+    commit_policy: Optional[CommitPolicy] = None,
+    incremental=False,
+    timings=False,
+    timings_path: Optional[Pathlike] = None,
+    dry_run=False,
+    plan_path: Optional[Pathlike] = None,
+    checkpoint_path: Optional[Pathlike] = None,
+    fail_on_load_errors=False,
 ):
     """
     Main entry point for the content creator. It allows to have a structure like:
@@ -566,118 +980,164 @@ def content_creator_from_folder(
     The file is a p.restapi JSON syntax. This method reads all the files and kick the
     runner in for process them.
 
-    """
-    # enable content non-globally addable types just for initial content
-    # creation
-    portal = api.portal.get()
-    for content_type in temp_enable_content_types:
-        enable_content_type(portal, content_type)
+    By default everything happens in the current transaction. Pass a
+    ``commit_policy`` to commit in batches instead (see
+    :class:`kitconcept.contentcreator.transactions.CommitPolicy`).
+
+    With ``incremental``, a manifest of the imported items is kept in the
+    portal and items whose JSON and local files did not change since the
+    previous import are skipped (see
+    :class:`kitconcept.contentcreator.manifest.ImportManifest`).
+
+    All the files are scanned before anything is created, to assign the UID
+    of every item up front. Internal links in blocks are stored as
+    resolveuid links right away, also when they point to items created
+    later. Only the items linking to other content created during the run
+    (e.g. items without an id or title) are refreshed after the creation (see
+    :class:`kitconcept.contentcreator.links.UIDMap`).
+
+    With ``timings`` (or a ``timings_path`` to write it to as JSON), the wall
+    and CPU time of each phase of the import is measured, per portal type,
+    and returned (see :class:`kitconcept.contentcreator.timing.Timings`).
+
+    With ``dry_run`` (or a ``plan_path`` to write it to as JSON), nothing is
+    created or edited. The objects the import would create, edit or skip,
+    the images and scales it would generate and the missing containers are
+    logged and returned instead (see
+    :class:`kitconcept.contentcreator.plan.ImportPlan`).
+
+    With a ``checkpoint_path``, the items committed so far are recorded in
+    that file. If the import crashes, running it again with the same file
+    skips them and resumes after the last commit (see
+    :class:`kitconcept.contentcreator.checkpoint.Checkpoint`).
+
+    The standalone JSON files which can't be parsed or validated are logged
+    and skipped (and listed in the plan of a dry run). With
+    ``fail_on_load_errors``, the import raises a
+    :class:`kitconcept.contentcreator.preload.LoadError` before creating
+    anything instead.
 
-    folder = pathlib.Path(__file__).parent / folder_name
-
-    # Load files from folder
-    items = []
-    has_content_json = False
-    translation_map = None
-
-    for path in folder.iterdir():
-        # Skip explicitly excluded filenames
-        if path.name.startswith(tuple(exclude)):
-            continue
-        # Skip directories
-        if path.is_dir():
-            continue
-
-        # If a content.json is found, proceed as if it contains a normal json arrayed
-        # structure
-        if path.name == "content.json":
-            has_content_json = True
-            logger.debug("content.json file found, creating content")
-            content_structure = load_json(path)
-            create_item_runner(
-                api.portal.get(),
-                content_structure,
-                default_lang=default_lang,
-                default_wf_state=default_wf_state,
-                ignore_wf_types=ignore_wf_types,
-                logger=logger,
-                base_image_path=base_image_path,
+    """
+    run_timings = Timings() if timings or timings_path is not None else None
+    timings_context = nullcontext()
+    if run_timings is not None:
+        timings_context = run_timings.activate()
+    dry_run = dry_run or plan_path is not None
+    # Changes made while planning (e.g. to the manifest) are undone
+    read_only = rolled_back() if dry_run else nullcontext()
+    with timings_context, profile_import(), read_only:
+        # enable content non-globally addable types just for initial content
+        # creation
+        portal = api.portal.get()
+        for content_type in temp_enable_content_types:
+            enable_content_type(portal, content_type)
+
+        folder = pathlib.Path(__file__).parent / folder_name
+        committer = None
+        if commit_policy is not None and not dry_run:
+            committer = Committer(commit_policy)
+        scale_queue = ScaleQueue()
+        import_context = ImportContext(portal)
+        plan = None
+        if dry_run:
+            plan = ImportPlan(
+                import_context,
                 do_not_edit_if_modified_after=do_not_edit_if_modified_after,
             )
-            continue
-        elif path.name == "siteroot.json":
-            logger.debug("Site root info found, applying changes")
-            root_info = load_json(path)
-            modify_siteroot(root_info)
-            continue
-        elif path.name == "translations.csv":
-            translation_map = path
-            continue
-
-        try:
-            structure = load_json(path)
-            items.append(Item(path, structure))
-        except (ValueError, FileNotFoundError) as e:
-            logger.error(f'Error in file structure: "{path}": {e}')
-
-    # Apply ordering rules:
-    # - Create containers first (lower depth in content tree first)
-    # - custom_order
-    # - types_order
-    # - alphabetical by id
-    def sort_key(item: Item):
-        name = item.path.name
-        item_type = item.structure.get("@type", "")
-        return (
-            len(name.split(".")[:-1]),  # depth
-            custom_order.index(name) if name in custom_order else maxsize,
-            types_order.index(item_type) if item_type in types_order else maxsize,
-            name.lower(),  # alphabetical
+        checkpoint = None
+        if checkpoint_path is not None:
+            checkpoint = Checkpoint(checkpoint_path)
+            if checkpoint.resumed:
+                logger.info(
+                    f"Resuming the import, {len(checkpoint)} items committed before"
+                )
+            if not dry_run:
+                checkpoint.attach(scale_queue, import_context.linked_paths)
+        options = dict(
+            default_lang=default_lang,
+            default_wf_state=default_wf_state,
+            ignore_wf_types=ignore_wf_types,
+            do_not_edit_if_modified_after=do_not_edit_if_modified_after,
         )
-
-    items.sort(key=sort_key)
-
-    # Process the items
-    for item in items:
-        # e.g. de.folder.json -> /de
-        splitted_path = item.path.stem.split(".")
-        plone_path = "/" + "/".join(splitted_path[:-1])
-        try:
-            container = api.content.get(path=plone_path)
-        except NotFound:
-            logger.error(f'Could not look up container under "{plone_path}"')
-        if container is None:
-            container = create_object(plone_path)
-        else:
-            if "id" not in item.structure:
-                item.structure["id"] = splitted_path[-1]
-            create_item_runner(
-                container,
-                [item.structure],
-                default_lang=default_lang,
-                default_wf_state=default_wf_state,
-                ignore_wf_types=ignore_wf_types,
+        manifest = ImportManifest(portal, options=options) if incremental else None
+        run = FolderImport(
+            ImportInputs(
+                folder, base_image_path, import_context, manifest, plan, checkpoint
+            ),
+            import_context,
+            dict(
+                options,
                 logger=logger,
                 base_image_path=base_image_path,
-                do_not_edit_if_modified_after=do_not_edit_if_modified_after,
-            )
-
-    # After creation, we refresh all the content created to update resolveuids
-    if len(items) > 0:
-        logger.debug("Refreshing content serialization after creation...")
-        for item in items:
-            refresh_objects_created_by_file(item.path)
-    if has_content_json:
-        logger.debug(
-            "Refreshing structured (content.json) content serialization after creation..."
+                scale_queue=scale_queue,
+            ),
+            committer=committer,
+            plan=plan,
         )
-        refresh_objects_created_by_structure(api.portal.get(), content_structure)
 
-    if translation_map is not None:
-        link_translations(translation_map)
+        with profile_phase("load"):
+            inputs = scan_folder(folder, exclude)
+            # Parse and validate all the files before changing anything
+            report = preload(inputs.paths, base_image_path)
+            report.log(logger, strict=fail_on_load_errors and not dry_run)
+            for path in report.errors:
+                run.inputs.skip(Item(path, {}).plone_path, "could not be loaded")
+            items = report.items
+            if inputs.siteroot is not None:
+                run.siteroot(inputs.siteroot)
+
+        # Assign the UIDs of all the items up front, so links to items created
+        # later can be resolved when their linking item is created
+        uid_map = import_context.uid_map = UIDMap(
+            import_context.lookup, import_context.id_resolver
+        )
+        with measure("prescan"), profile_phase("prescan"):
+            if inputs.content_json is not None:
+                for data in iter_json(inputs.content_json):
+                    uid_map.add(data, "/")
+            for item in items:
+                uid_map.add(item.structure, item.container_path, id_=item.id)
 
-    for content_type in temp_enable_content_types:
-        disable_content_type(portal, content_type)
+        # If a content.json is found, proceed as if it contains a normal json arrayed
+        # structure
+        if inputs.content_json is not None:
+            with profile_phase("content"):
+                run.content(inputs.content_json)
+
+        # Process the items, parents first
+        with profile_phase("items"):
+            run.items(items, custom_order=custom_order, types_order=types_order)
+
+        # The refresh and linking the translations search the catalog
+        with profile_phase("refresh"):
+            import_context.indexing_queue.flush()
+            run.refresh()
+        if inputs.translations is not None:
+            run.translations(inputs.translations)
+
+        for content_type in temp_enable_content_types:
+            disable_content_type(portal, content_type)
+
+        if committer is not None:
+            with profile_phase("commit"):
+                committer.commit()
+
+        with profile_phase("scales"):
+            scale_queue.process()
+
+        if checkpoint is not None and not dry_run:
+            checkpoint.finish()
+
+    if plan is not None:
+        plan.log(logger)
+        if plan_path is not None:
+            plan.write(plan_path)
+        return plan.report()
+    if run_timings is None:
+        return None
+    if timings_path is not None:
+        run_timings.write(timings_path)
+    return run_timings.report()
 
 
 def modify_siteroot(root_info):
@@ -1,3 +1,5 @@
+from functools import lru_cache
+from io import BytesIO
 from PIL import Image
 from PIL import ImageDraw
 from PIL import ImageFont
@@ -5,6 +7,14 @@ from PIL import ImageFont
 import os
 
 
+FONT_PATH = os.path.join(os.path.dirname(__file__), "Poppins-Regular.ttf")
+
+
+@lru_cache(maxsize=None)
+def get_font(size=20):
+    return ImageFont.truetype(FONT_PATH, size)
+
+
 def generate_image(width=400, height=300):
     image = Image.new("RGB", (width, height), color=(73, 109, 137))
     draw = ImageDraw.Draw(image)
@@ -14,12 +24,22 @@ def generate_image(width=400, height=300):
     )
 
     text = "{} x {}".format(width, height)
-    font = ImageFont.truetype(
-        os.path.join(os.path.dirname(__file__), "Poppins-Regular.ttf"), 20
-    )
+    font = get_font()
     center = (width / 2, height / 2)
     text_size = font.getsize(text)
     text_center = (center[0] - text_size[0] / 2, center[1] - text_size[1] / 2)
     draw.text(text_center, text, font=font, fill=(33, 22, 22))
 
     return image
+
+
+@lru_cache(maxsize=32)
+def generate_image_data(width=400, height=300, format_="png"):
+    """Return the encoded data of a dummy image.
+
+    The result is cached by ``(width, height, format_)``, so repeated
+    placeholders are only drawn and encoded once.
+    """
+    data = BytesIO()
+    generate_image(width, height).save(data, format_)
+    return data.getvalue()
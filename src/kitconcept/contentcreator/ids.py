@@ -0,0 +1,69 @@
+"""Resolution of the ids of content items given by their title only."""
+from Acquisition import aq_base
+from plone.app.content.interfaces import INameFromTitle
+from plone.i18n.normalizer.interfaces import IURLNormalizer
+from plone.i18n.normalizer.interfaces import IUserPreferredURLNormalizer
+from plone.restapi.services.content.utils import create
+from Products.CMFPlone.utils import safe_hasattr
+from typing import Dict
+from zope.component import getUtility
+from zope.container.interfaces import INameChooser
+from zope.globalrequest import getRequest
+
+
+class IdResolver:
+    """Resolve the id of items without an ``id``, from their title.
+
+    The title is normalized like the name chooser of Plone does, so the id is
+    the one of the existing item with that title, or the one a new item will
+    get. Results are cached per container, so the creation and the refresh
+    pass don't compute them twice.
+
+    Only titles which can't be used as an id as they are (e.g. because they
+    clash with an attribute of the container) need a throwaway object to ask
+    the name chooser, like ``guess_id`` used to do for every item.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, Dict[str, str]] = {}
+
+    def normalize(self, title: str) -> str:
+        request = getRequest()
+        if request is not None:
+            return IUserPreferredURLNormalizer(request).normalize(title)
+        return getUtility(IURLNormalizer).normalize(title)
+
+    def resolve(self, data: dict, container) -> str:
+        """Return the id for ``data`` in ``container``."""
+        if data.get("id"):
+            return data["id"]
+        title = data.get("title")
+        if not title:
+            return self.choose_name(data, container)
+        ids = self._ids.setdefault("/".join(container.getPhysicalPath()), {})
+        id_ = ids.get(title)
+        if id_ is None:
+            id_ = self.normalize(title)
+            if container.get(id_) is None and safe_hasattr(aq_base(container), id_):
+                id_ = self.choose_name(data, container)
+            ids[title] = id_
+        return id_
+
+    def choose_name(self, data: dict, container) -> str:
+        """Ask the name chooser with a throwaway object."""
+        obj = create(container, data.get("@type"), title=data.get("title"))
+        chooser = INameChooser(container)
+        # INameFromTitle adaptable objects should not get a name
+        # suggestion. NameChooser would prefer the given name instead of
+        # the one provided by the INameFromTitle adapter.
+        suggestion = None
+        name_from_title = INameFromTitle(obj, None)
+        if name_from_title is None:
+            suggestion = obj.Title()
+        id_ = chooser.chooseName(suggestion, obj)
+
+        # Case 1: Content exists and the chooser has answered an id_ ending in "-1"
+        if container.get(id_[:-2], False):
+            return id_[:-2]
+        # Case 2: Content does not exits and the chooser has guessed the correct id
+        return id_
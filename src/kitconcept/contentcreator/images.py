@@ -1,132 +1,241 @@
-from io import BytesIO
-from kitconcept.contentcreator.dummy_image import generate_image
+from .timing import measure
+from .transactions import TransactionalCache
+from Acquisition import aq_base
+from kitconcept.contentcreator.dummy_image import generate_image_data
 from plone.namedfile.file import NamedBlobFile
 from plone.namedfile.file import NamedBlobImage
 
+import copy
+import hashlib
 import magic
 import os
-
-
-def process_local_images(data, obj, base_image_path):
-    get_file_type = magic.Magic(mime=True)
-    image_fieldnames_added = []
-
-    if data.get("set_dummy_image", False) and isinstance(
-        data.get("set_dummy_image"), list
-    ):
-        new_file = BytesIO()
-        generate_image().save(new_file, "png")
-        new_file = new_file if type(new_file) == str else new_file.getvalue()
-        for image_field in data["set_dummy_image"]:
-            setattr(
-                obj,
-                image_field,
-                NamedBlobImage(data=new_file, contentType="image/png"),
+import shutil
+import tempfile
+
+
+DUMMY_IMAGE_SIZE = (400, 300)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def parse_size(size):
+    """Parse a dummy image size given as ``"800x600"`` or ``[800, 600]``."""
+    if not size:
+        return DUMMY_IMAGE_SIZE
+    if isinstance(size, str):
+        size = size.lower().split("x")
+    width, height = size
+    return int(width), int(height)
+
+
+def get_dummy_fields(value, default_fieldname):
+    """Return a mapping of fieldname to size for a ``set_dummy_*`` value.
+
+    The value is a list of fieldnames, a mapping of fieldname to size, or
+    ``true`` for the legacy behavior (use the default fieldname).
+    """
+    if isinstance(value, dict):
+        return {fieldname: parse_size(size) for fieldname, size in value.items()}
+    if isinstance(value, list):
+        return {fieldname: DUMMY_IMAGE_SIZE for fieldname in value}
+    if isinstance(value, bool) and value:
+        return {default_fieldname: DUMMY_IMAGE_SIZE}
+    return {}
+
+
+def get_local_fields(value, default_fieldname):
+    """Return a mapping of fieldname to filename for a ``set_local_*`` value.
+
+    The value is a mapping of fieldname to filename, or a filename for the
+    legacy behavior (use the default fieldname).
+    """
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value:
+        return {default_fieldname: value}
+    return {}
+
+
+def get_stat_key(path):
+    """Identify a file by its real path, size and modification time."""
+    stat = os.stat(path)
+    return (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+
+
+class MimeTypeSniffer:
+    """Detect the content type of local files.
+
+    Only the first ``header_size`` bytes of a file are passed to libmagic, and
+    the results are cached by path, size and modification time. Create one
+    sniffer per import run.
+    """
+
+    def __init__(self, header_size=64 * 1024):
+        self.header_size = header_size
+        self._magic = magic.Magic(mime=True)
+        self._cache = {}
+
+    def from_file(self, path):
+        key = get_stat_key(path)
+        content_type = self._cache.get(key)
+        if content_type is None:
+            with open(path, "rb") as new_file:
+                header = new_file.read(self.header_size)
+            content_type = self._cache[key] = self._magic.from_buffer(header)
+        return content_type
+
+
+class BlobRegistry:
+    """Share the blob data of identical local files during one import run.
+
+    Files are identified by the SHA-256 hash of their content, so each file
+    is read and its content type detected only once. The fields of all the
+    objects using the same file share one blob instead of storing a copy
+    each. Plone replaces field values instead of writing into their blobs,
+    so sharing them is safe.
+    """
+
+    def __init__(self, sniffer=None):
+        self.sniffer = sniffer if sniffer is not None else MimeTypeSniffer()
+        self._digests = {}
+        self._values = TransactionalCache()
+
+    def get(self, klass, base_path, filename):
+        """Return a ``klass`` value (e.g. ``NamedBlobImage``) for a local file."""
+        path = os.path.join(base_path, filename)
+        stat_key = get_stat_key(path)
+
+        digest = self._digests.get(stat_key)
+        if digest is None:
+            digest = self._digests[stat_key] = get_file_digest(path)
+        prototype = self._values.get((klass, digest))
+        if prototype is None:
+            value = create_blob_value(
+                klass, path, filename, self.sniffer.from_file(path)
             )
+            self._values[(klass, digest)] = value
+            return value
+
+        # A shallow copy refers to the same blob
+        value = copy.copy(prototype)
+        value.filename = filename
+        return value
+
+
+def get_file_digest(path, chunk_size=CHUNK_SIZE):
+    """Return the SHA-256 hex digest of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as new_file:
+        for chunk in iter(lambda: new_file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def create_blob_value(klass, path, filename, content_type):
+    """Create a ``klass`` value from a local file without loading it in memory.
+
+    The file is copied by the operating system into a temporary file
+    (``shutil.copyfile`` uses ``sendfile`` where available), which the blob
+    consumes: ZODB renames it to the uncommitted file of the new blob, which
+    is in the same temporary directory, and the storage moves that into the
+    blob directory on commit. So the memory needed does not depend on the
+    file size, images only have their header read for their dimensions.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix="contentcreator-")
+    os.close(fd)
+    try:
+        shutil.copyfile(path, tmp_path)
+        with open(tmp_path, "rb") as tmp_file:
+            return klass(data=tmp_file, filename=filename, contentType=content_type)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def process_local_images(data, obj, base_image_path, blob_registry=None):
+    with measure("images", obj.portal_type):
+        return _process_local_images(data, obj, base_image_path, blob_registry)
+
+
+def _process_local_images(data, obj, base_image_path, blob_registry=None):
+    if blob_registry is None:
+        blob_registry = BlobRegistry()
+    image_fieldnames_added = []
 
-        image_fieldnames_added + data["set_dummy_image"]
-
-    elif data.get("set_dummy_image", False) and isinstance(
-        data.get("set_dummy_image"), bool
-    ):
-        # Legacy behavior, set_dummy_image is a boolean
-        obj.image = NamedBlobImage(
-            data=generate_image().tobytes(), contentType="image/png"
+    dummy_images = get_dummy_fields(data.get("set_dummy_image"), "image")
+    for image_field, size in dummy_images.items():
+        setattr(
+            obj,
+            image_field,
+            NamedBlobImage(data=generate_image_data(*size), contentType="image/png"),
         )
-
-        image_fieldnames_added.append("image")
-
-    if data.get("set_dummy_file", False) and isinstance(
-        data.get("set_dummy_file"), list
-    ):
-        new_file = BytesIO()
-        generate_image().save(new_file, "png")
-        new_file = new_file if type(new_file) == str else new_file.getvalue()
-        for image_field in data["set_dummy_file"]:
-            setattr(
-                obj,
-                image_field,
-                NamedBlobFile(data=new_file, contentType="image/png"),
-            )
-
-    elif data.get("set_dummy_file", False) and isinstance(
-        data.get("set_dummy_file"), bool
-    ):
-        # Legacy behavior, set_dummy_file is a boolean
-        obj.file = NamedBlobFile(
-            data=generate_image().tobytes(), contentType="image/png"
+        image_fieldnames_added.append(image_field)
+
+    dummy_files = get_dummy_fields(data.get("set_dummy_file"), "file")
+    for file_field, size in dummy_files.items():
+        setattr(
+            obj,
+            file_field,
+            NamedBlobFile(data=generate_image_data(*size), contentType="image/png"),
         )
 
-    if data.get("set_local_image", False) and isinstance(
-        data.get("set_local_image"), dict
-    ):
-        for image_data in data["set_local_image"].items():
-            new_file = open(os.path.join(base_image_path, image_data[1]), "rb")
-            # Get the correct content-type
-            content_type = get_file_type.from_buffer(new_file.read())
-            new_file.seek(0)
-
-            setattr(
-                obj,
-                image_data[0],
-                NamedBlobImage(
-                    data=new_file.read(),
-                    filename=image_data[1],
-                    contentType=content_type,
-                ),
-            )
-
-            image_fieldnames_added.append(image_data[0])
-
-    elif data.get("set_local_image", False) and isinstance(
-        data.get("set_local_image"), str
-    ):
-        new_file = open(
-            os.path.join(base_image_path, data.get("set_local_image")), "rb"
+    local_images = get_local_fields(data.get("set_local_image"), "image")
+    for image_field, filename in local_images.items():
+        setattr(
+            obj,
+            image_field,
+            blob_registry.get(NamedBlobImage, base_image_path, filename),
         )
-        # Get the correct content-type
-        content_type = get_file_type.from_buffer(new_file.read())
-        new_file.seek(0)
-
-        obj.image = NamedBlobImage(
-            data=new_file.read(),
-            filename=data.get("set_local_image"),
-            contentType=content_type,
+        image_fieldnames_added.append(image_field)
+
+    local_files = get_local_fields(data.get("set_local_file"), "file")
+    for file_field, filename in local_files.items():
+        setattr(
+            obj,
+            file_field,
+            blob_registry.get(NamedBlobFile, base_image_path, filename),
         )
 
-        image_fieldnames_added.append("image")
+    return image_fieldnames_added
 
-    if data.get("set_local_file", False) and isinstance(
-        data.get("set_local_file"), dict
-    ):
-        for image_data in data["set_local_file"].items():
-            new_file = open(os.path.join(base_image_path, image_data[1]), "rb")
-            # Get the correct content-type
-            content_type = get_file_type.from_buffer(new_file.read())
-            new_file.seek(0)
-
-            setattr(
-                obj,
-                image_data[0],
-                NamedBlobFile(
-                    data=new_file.read(),
-                    filename=image_data[1],
-                    contentType=content_type,
-                ),
-            )
 
-    elif data.get("set_local_file", False) and isinstance(
-        data.get("set_local_file"), str
+def get_local_filenames(data):
+    """Return the local files referenced by ``data`` and all its children."""
+    filenames = []
+    for key, default in (("set_local_image", "image"), ("set_local_file", "file")):
+        filenames.extend(get_local_fields(data.get(key), default).values())
+    for child in data.get("items", []):
+        filenames.extend(get_local_filenames(child))
+    return filenames
+
+
+def get_blob_fieldnames(data):
+    """Return the names of the fields that get blob data from ``data``."""
+    fieldnames = []
+    for key, default in (
+        ("set_dummy_image", "image"),
+        ("set_dummy_file", "file"),
+        ("set_local_image", "image"),
+        ("set_local_file", "file"),
     ):
-        new_file = open(os.path.join(base_image_path, data.get("set_local_file")), "rb")
-        # Get the correct content-type
-        content_type = get_file_type.from_buffer(new_file.read())
-        new_file.seek(0)
-
-        obj.file = NamedBlobFile(
-            data=new_file.read(),
-            filename=data.get("set_local_file"),
-            contentType=content_type,
-        )
-
-    return image_fieldnames_added
+        value = data.get(key, False)
+        if isinstance(value, (list, dict)):
+            fieldnames.extend(value)
+        elif value:
+            fieldnames.append(default)
+    # plone.restapi serialization mapping (base64 encoded data)
+    for key, value in data.items():
+        if isinstance(value, dict) and "data" in value and key not in fieldnames:
+            fieldnames.append(key)
+    return fieldnames
+
+
+def get_blob_size(obj, data):
+    """Return the size in bytes of the blob data set on ``obj`` from ``data``."""
+    size = 0
+    for fieldname in get_blob_fieldnames(data):
+        value = getattr(aq_base(obj), fieldname, None)
+        get_size = getattr(value, "getSize", None)
+        if get_size is not None:
+            size += get_size()
+    return size
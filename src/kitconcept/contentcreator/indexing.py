@@ -0,0 +1,69 @@
+"""Deferred catalog indexing of the objects of an import run."""
+from .timing import measure
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Set
+
+import transaction
+
+
+class IndexingQueue:
+    """Collect the reindex operations of an import run and merge them.
+
+    The runner touches an object several times after it has been
+    created or edited (UID, exclude from navigation, effective date). Instead
+    of reindexing it each time, the indexes are collected per object and
+    reindexed once, with the union of the indexes, when the queue is flushed.
+
+    The queue is flushed before each commit, so batches are committed with an
+    up-to-date catalog. Call :meth:`flush` before searching the catalog for
+    objects of the same transaction.
+
+    Plone queues the reindex operations of a transaction as well, but
+    processes them as soon as the catalog is searched. This queue only
+    flushes when told to.
+    """
+
+    def __init__(self):
+        # path -> (object, indexes or None for all of them)
+        self._pending: Dict[str, tuple] = {}
+        self._txn = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _join(self):
+        txn = transaction.get()
+        if txn is not self._txn:
+            # The previous transaction was aborted, its objects are gone
+            self._pending = {}
+            self._txn = txn
+            txn.addBeforeCommitHook(self.flush)
+
+    def reindex(self, obj, idxs: Optional[Iterable[str]] = None):
+        """Queue a reindex of ``obj``, of all indexes if ``idxs`` is empty."""
+        self._join()
+        key = "/".join(obj.getPhysicalPath())
+        pending: Optional[Set[str]] = set(idxs) if idxs else None
+        if key in self._pending:
+            previous = self._pending[key][1]
+            if previous is None or pending is None:
+                pending = None
+            else:
+                pending |= previous
+        self._pending[key] = (obj, pending)
+
+    def flush(self):
+        """Reindex the queued objects."""
+        if transaction.get() is not self._txn:
+            # Nothing was queued in this transaction
+            self._pending = {}
+            return
+        pending, self._pending = self._pending, {}
+        for obj, idxs in pending.values():
+            with measure("indexing", obj.portal_type):
+                if idxs is None:
+                    obj.reindexObject()
+                else:
+                    obj.reindexObject(idxs=sorted(idxs))
@@ -0,0 +1,142 @@
+"""Internal links in the blocks of imported content."""
+from plone.uuid.interfaces import IUUID
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from urllib.parse import urlparse
+
+import uuid
+
+
+# Keys of the block values that plone.restapi turns into resolveuid links
+LINK_KEYS = ("@id", "href", "preview_image", "url")
+
+# Views of an item, a link to one of them is resolved with the item's UID
+VIEW_SEGMENTS = ("view", "@@view", "@@images", "@@download")
+
+
+def iter_internal_links(value, portal_url: Optional[str] = None) -> Iterator[str]:
+    """Yield the internal links (paths or portal URLs) in a blocks value.
+
+    Links which are already ``resolveuid`` links are not yielded.
+    """
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from iter_internal_links(item, portal_url)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_internal_links(item, portal_url)
+    elif isinstance(value, str) and "resolveuid/" not in value:
+        if value.startswith("/") and not value.startswith("//"):
+            yield value
+        elif portal_url and value.startswith(portal_url + "/"):
+            yield value
+
+
+def has_internal_links(data: dict, portal_url: Optional[str] = None) -> bool:
+    """Whether the blocks of ``data`` link to other content by path.
+
+    The links to content which did not exist yet when the item was created
+    can only be turned into ``resolveuid`` links by refreshing the item.
+    """
+    for link in iter_internal_links(data.get("blocks", {}), portal_url):
+        return True
+    return False
+
+
+class UIDMap:
+    """Final paths and UIDs of the items of an import run.
+
+    All the inputs are scanned with :meth:`add` before anything is created.
+    Each item gets its UID up front: the one in its data, the one of the
+    existing object at its path, or a new one. When the item is created,
+    :meth:`assign` puts the UID into its data, so the runner creates the
+    object with it, and :meth:`resolve_links` turns the links to any item of
+    the run into ``resolveuid`` links, even if it is created later.
+    """
+
+    def __init__(self, lookup, id_resolver):
+        self.lookup = lookup
+        self.id_resolver = id_resolver
+        self.portal_url = lookup.portal.absolute_url()
+        self._uids: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self._uids)
+
+    def get(self, path: str) -> Optional[str]:
+        return self._uids.get(self.lookup.get_key(path))
+
+    def as_dict(self) -> Dict[str, str]:
+        """Return the UIDs by path, e.g. to hand them to another process."""
+        return dict(self._uids)
+
+    def update(self, uids: Dict[str, str]):
+        """Add UIDs by path, as returned by :meth:`as_dict`."""
+        self._uids.update(uids)
+
+    def add(self, data: dict, container_path: str, id_: Optional[str] = None):
+        """Assign UIDs to ``data`` and its items, without modifying them."""
+        for item, path in self._walk(data, container_path, id_):
+            if path in self._uids:
+                continue
+            uid = item.get("UID")
+            if not uid:
+                obj = self.lookup.get(path)
+                uid = IUUID(obj, None) if obj is not None else None
+            self._uids[path] = uid or uuid.uuid4().hex
+
+    def assign(self, data: dict, container_path: str, id_: Optional[str] = None):
+        """Set the UIDs assigned by :meth:`add` in ``data`` and its items."""
+        for item, path in self._walk(data, container_path, id_):
+            if not item.get("UID") and path in self._uids:
+                item["UID"] = self._uids[path]
+
+    def resolve_links(self, value):
+        """Return ``value`` with the links to items replaced by resolveuids."""
+        if isinstance(value, dict):
+            return {
+                key: self.resolve_link(item)
+                if key in LINK_KEYS and isinstance(item, str)
+                else self.resolve_links(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self.resolve_links(item) for item in value]
+        return value
+
+    def resolve_link(self, link: str) -> str:
+        """Return the resolveuid link for ``link``, if it points to an item.
+
+        Links to a view of an item (e.g. ``/de/page/@@images/image``) are
+        resolved as well, other links below an item are returned unchanged.
+        """
+        if "resolveuid/" in link:
+            return link
+        if link.startswith(self.portal_url + "/"):
+            path = link[len(self.portal_url) :]
+        elif link.startswith("/") and not link.startswith("//"):
+            path = link
+        else:
+            return link
+        tail = path[len(urlparse(path).path) :]  # query and fragment
+        segments = self.lookup.get_key(urlparse(path).path).strip("/").split("/")
+        for index in range(len(segments), 0, -1):
+            if index < len(segments) and segments[index] not in VIEW_SEGMENTS:
+                continue
+            uid = self._uids.get("/" + "/".join(segments[:index]))
+            if uid is not None:
+                return "/".join(["..", "resolveuid", uid] + segments[index:]) + tail
+        return link
+
+    def _walk(self, data, container_path, id_=None):
+        id_ = id_ or data.get("id")
+        if not id_ and data.get("title"):
+            id_ = self.id_resolver.normalize(data["title"])
+        if not id_:
+            # The path of the item and its items can't be known up front
+            return
+        path = container_path.rstrip("/") + "/" + id_
+        yield data, path
+        for item in data.get("items", []):
+            yield from self._walk(item, path)
@@ -0,0 +1,57 @@
+"""Content lookups by path during an import run."""
+from .transactions import TransactionalCache
+from Acquisition import aq_base
+from kitconcept import api
+
+
+class ContentLookup:
+    """Cache of the objects of an import run by their path.
+
+    Objects are registered as they are created, and looked up in the portal
+    only the first time they are asked for, so traversing from the portal
+    root is paid once per object instead of once per lookup.
+
+    Paths can be given relative to the portal (``/de/folder``) or as physical
+    paths (``/plone/de/folder``).
+    """
+
+    def __init__(self, portal=None):
+        self.portal = portal if portal is not None else api.portal.get()
+        self.portal_path = "/".join(self.portal.getPhysicalPath())
+        self._objects = TransactionalCache()
+
+    def get_key(self, path: str) -> str:
+        """Return the path relative to the portal, e.g. ``/de/folder``."""
+        if path == self.portal_path or path.startswith(self.portal_path + "/"):
+            path = path[len(self.portal_path) :]
+        return "/" + path.strip("/")
+
+    def get(self, path: str):
+        """Return the object at ``path`` or ``None``."""
+        key = self.get_key(path)
+        if key == "/":
+            return self.portal
+        obj = self._objects.get(key)
+        if obj is None:
+            parent_key, id_ = key.rsplit("/", 1)
+            container = self.get(parent_key or "/")
+            if container is None:
+                return None
+            obj = self._get_child(container, id_)
+            if obj is not None:
+                self._objects[key] = obj
+        return obj
+
+    def register(self, obj):
+        """Register a created (or edited) object."""
+        self._objects[self.get_key("/".join(obj.getPhysicalPath()))] = obj
+
+    def discard(self, path: str):
+        self._objects.pop(self.get_key(path))
+
+    def _get_child(self, container, id_):
+        # Contained objects only, never acquired ones
+        get_ob = getattr(aq_base(container), "_getOb", None)
+        if get_ob is None:
+            return None
+        return container._getOb(id_, None)
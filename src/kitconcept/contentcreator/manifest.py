@@ -0,0 +1,88 @@
+"""Manifest of previous imports, to skip unchanged content on re-import."""
+from .images import get_file_digest
+from .images import get_local_filenames
+from BTrees.OOBTree import OOBTree
+from zope.annotation.interfaces import IAnnotations
+
+import hashlib
+import json
+import os
+
+
+ANNOTATION_KEY = "kitconcept.contentcreator.manifest"
+
+
+class ImportManifest:
+    """Content hashes of the items of previous imports.
+
+    The manifest is stored in an annotation of the portal, so it is committed
+    together with the content it describes. An item (a standalone JSON file or
+    a top-level entry of ``content.json``) is unchanged if the hash of its
+    JSON, of the local files it references (including those of its children)
+    and of the import options is the same as in the previous import.
+
+    :param portal: The Plone site.
+    :param options: Import options that affect the result (e.g. the default
+                    language), an item is changed when they change.
+    :type options: dict
+    """
+
+    def __init__(self, portal, options=None):
+        annotations = IAnnotations(portal)
+        if ANNOTATION_KEY not in annotations:
+            annotations[ANNOTATION_KEY] = OOBTree()
+        self.portal = portal
+        self.entries = annotations[ANNOTATION_KEY]
+        self.options = json.dumps(options or {}, sort_keys=True, default=str)
+
+    def get_file_digest(self, path):
+        """Return the digest of a local file.
+
+        The digest is kept in the manifest together with the size and the
+        modification time of the file, so an unchanged file is only read once.
+        """
+        key = "file:" + os.path.realpath(path)
+        stat = os.stat(path)
+        cached = self.entries.get(key)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = get_file_digest(path)
+        self.entries[key] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def get_digest(self, data, base_image_path):
+        """Return the digest of an item."""
+        digest = hashlib.sha256(self.options.encode())
+        digest.update(json.dumps(data, sort_keys=True).encode())
+        for filename in sorted(set(get_local_filenames(data))):
+            path = os.path.join(base_image_path, filename)
+            if os.path.exists(path):
+                file_digest = self.get_file_digest(path)
+            else:
+                file_digest = "missing"
+            digest.update(f"{filename}:{file_digest}".encode())
+        return digest.hexdigest()
+
+    def is_unchanged(self, key, digest, path=None):
+        """Return whether an item was imported before with the same digest.
+
+        :param key: Identifies the item, e.g. its filename.
+        :param digest: The digest from :meth:`get_digest`.
+        :param path: Path of the created object, relative to the portal. If
+                     given, the item also counts as changed if the object
+                     does not exist (anymore).
+        """
+        if self.entries.get(key) != digest:
+            return False
+        if path is not None:
+            obj = self.portal.unrestrictedTraverse(path.lstrip("/"), None)
+            # Make sure the object was not acquired from elsewhere
+            portal_path = "/".join(self.portal.getPhysicalPath())
+            return obj is not None and "/".join(obj.getPhysicalPath()) == (
+                portal_path + "/" + path.lstrip("/")
+            )
+        return True
+
+    def record(self, key, digest):
+        if self.entries.get(key) != digest:
+            self.entries[key] = digest
@@ -0,0 +1,398 @@
+"""Import of a content folder in several processes, one subtree each.
+
+The inputs of a content folder (the top-level entries of ``content.json``
+and the standalone JSON files) are split into partitions by their top-level
+path, e.g. ``/de`` and ``/en``. Partitions don't share any object, so each
+of them is created by a worker process with a ZODB connection of its own,
+e.g. to a ZEO server or RelStorage. The refresh of the items with links
+the UIDs could not resolve, the site root and the translations, which span
+partitions, are done by the coordinating process at the end.
+
+The workers are forked from the coordinating process by default, so they
+inherit its Zope configuration. ``db_factory`` must open a new database
+(client) in each of them, e.g. ``functools.partial(ZEO.DB, address)``.
+"""
+from .context import ImportContext
+from .creator import create_item_runner
+from .creator import create_object
+from .creator import disable_content_type
+from .creator import enable_content_type
+from .creator import iter_json
+from .creator import load_json
+from .creator import modify_siteroot
+from .creator import refresh_object
+from .creator import scan_folder
+from .links import UIDMap
+from .preload import preload
+from .scales import ScaleQueue
+from .scheduler import Item
+from .scheduler import schedule
+from .transactions import CommitPolicy
+from .transactions import Committer
+from .translations import link_translations
+from .utils import logger
+from AccessControl.SecurityManagement import getSecurityManager
+from AccessControl.SecurityManagement import newSecurityManager
+from AccessControl.SecurityManagement import setSecurityManager
+from AccessControl.SpecialUsers import system
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from Products.CMFCore.utils import getToolByName
+from Testing.makerequest import makerequest
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from zope.component.hooks import getSite
+from zope.component.hooks import setSite
+from zope.globalrequest import getRequest
+from zope.globalrequest import setRequest
+
+import multiprocessing
+import os
+import pathlib
+import transaction
+
+
+@dataclass
+class Partition:
+    """Top-level ``content.json`` entries and standalone items below ``root``.
+
+    The entries are given by their index in ``content.json``, which is
+    streamed again by the process creating them.
+    """
+
+    root: str
+    entries: List[int] = field(default_factory=list)
+    items: List[Item] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.entries) + len(self.items)
+
+
+@dataclass
+class PartitionResult:
+    root: str
+    # Paths of the created or edited objects
+    paths: List[str] = field(default_factory=list)
+    # Paths of the objects with links to refresh in the final phase
+    linked_paths: List[str] = field(default_factory=list)
+    error: str = ""
+
+
+def partition(
+    entries: Iterable[dict],
+    items: List[Item],
+    normalize: Callable[[str], str],
+    custom_order=(),
+    types_order=(),
+) -> List[Partition]:
+    """Split the inputs of an import into disjoint subtrees.
+
+    The entries of ``content.json`` (streamed, only their index is kept) go to the partition of their id (or
+    normalized title), the standalone items to the one of their work unit
+    (see :func:`kitconcept.contentcreator.scheduler.schedule`). Within a
+    partition, the entries are created first, then the items in the order
+    of the scheduler.
+
+    :returns: The partitions, largest first.
+    """
+    partitions: Dict[str, Partition] = {}
+    for index, data in enumerate(entries):
+        id_ = data.get("id")
+        if not id_ and data.get("title"):
+            id_ = normalize(data["title"])
+        # Entries without an id or title get theirs from the name chooser
+        root = "/" + (id_ or "")
+        partitions.setdefault(root, Partition(root)).entries.append(index)
+    for unit in schedule(items, custom_order=custom_order, types_order=types_order):
+        partitions.setdefault(unit.root, Partition(unit.root)).items.extend(unit.items)
+    return sorted(partitions.values(), key=len, reverse=True)
+
+
+def enable_content_types(portal, content_types):
+    """Globally allow ``content_types`` for the import.
+
+    The types which are allowed already are not written, so the workers
+    don't conflict on the types the coordinating process enabled.
+    """
+    portal_types = getToolByName(portal, "portal_types")
+    for content_type in content_types:
+        if not getattr(portal_types, content_type).global_allow:
+            enable_content_type(portal, content_type)
+
+
+@contextmanager
+def open_site(db, site_path: str, content_types=()):
+    """Open a connection to ``db`` and set up the Plone site at ``site_path``.
+
+    ``content_types`` are globally allowed in the transaction (see
+    :func:`enable_content_types`). The transaction is aborted and the
+    connection closed afterwards, and the site, request and security manager
+    of the caller are restored.
+    """
+    site, request, security_manager = getSite(), getRequest(), getSecurityManager()
+    connection = db.open()
+    try:
+        app = makerequest(connection.root()["Application"])
+        portal = app.unrestrictedTraverse(site_path.lstrip("/"))
+        setSite(portal)
+        setRequest(app.REQUEST)
+        newSecurityManager(app.REQUEST, system)
+        enable_content_types(portal, content_types)
+        yield portal
+    finally:
+        transaction.abort()
+        connection.close()
+        setSecurityManager(security_manager)
+        setRequest(request)
+        setSite(site)
+
+
+def run_partition(
+    db,
+    site_path: str,
+    part: Partition,
+    uids: Dict[str, str],
+    options: dict,
+    commit_policy: CommitPolicy,
+    content_types=(),
+    content_json: Optional[pathlib.Path] = None,
+) -> PartitionResult:
+    """Create the content of a partition with a connection of its own.
+
+    Each top-level entry and item is committed according to
+    ``commit_policy`` and retried on ``ConflictError``. The entries of the
+    partition are read from ``content_json`` one by one.
+    """
+    result = PartitionResult(part.root)
+    try:
+        with open_site(db, site_path, content_types) as portal:
+            import_context = ImportContext(portal)
+            lookup = import_context.lookup
+            import_context.uid_map = UIDMap(lookup, import_context.id_resolver)
+            import_context.uid_map.update(uids)
+            committer = Committer(commit_policy)
+            scale_queue = ScaleQueue()
+            runner_options = dict(
+                options,
+                committer=committer,
+                scale_queue=scale_queue,
+                created_paths=result.paths,
+                import_context=import_context,
+            )
+
+            def create_item(item: Item):
+                container = lookup.get(item.container_path)
+                if container is None:
+                    container = create_object(
+                        item.container_path, is_folder=True, lookup=lookup
+                    )
+                structure = dict(item.structure)
+                structure.setdefault("id", item.id)
+                create_item_runner(container, [structure], **runner_options)
+
+            if part.entries:
+                indexes = set(part.entries)
+                for index, data in enumerate(iter_json(content_json)):
+                    if index in indexes:
+                        import_context.uid_map.assign(data, "/")
+                        create_item_runner(portal, [data], **runner_options)
+            for item in part.items:
+                committer.run(create_item, item, description=item.plone_path)
+            committer.commit()
+            scale_queue.process()
+        # Items retried after a ConflictError are listed again
+        result.paths = list(dict.fromkeys(result.paths))
+        result.linked_paths = list(dict.fromkeys(import_context.linked_paths))
+    except Exception as e:  # noqa: B902
+        result.error = f"{type(e).__name__}: {e}"
+        logger.error(f"{part.root} - partition failed: {result.error}")
+    return result
+
+
+# State of a worker process, set up by _init_worker
+_worker = None
+
+
+def _init_worker(
+    db_factory, site_path, uids, options, commit_policy, content_types, content_json
+):
+    global _worker
+    _worker = (
+        db_factory(),
+        site_path,
+        uids,
+        options,
+        commit_policy,
+        content_types,
+        content_json,
+    )
+
+
+def _run_in_worker(part: Partition) -> PartitionResult:
+    db, site_path, uids, options, commit_policy, content_types, content_json = _worker
+    return run_partition(
+        db, site_path, part, uids, options, commit_policy, content_types, content_json
+    )
+
+
+def import_in_parallel(
+    db_factory: Callable,
+    site_path: str,
+    folder_name,
+    base_image_path,
+    workers: Optional[int] = None,
+    default_lang=None,
+    default_wf_state=None,
+    ignore_wf_types=["Image", "File"],
+    temp_enable_content_types=[],
+    do_not_edit_if_modified_after=None,
+    exclude=[],
+    types_order=[],
+    custom_order=[],
+    commit_policy: Optional[CommitPolicy] = None,
+    mp_context=None,
+    fail_on_load_errors=False,
+) -> List[PartitionResult]:
+    """Import a content folder with ``workers`` processes.
+
+    The options are the ones of ``content_creator_from_folder``.
+    ``workers`` defaults to the ``CREATOR_IMPORT_WORKERS`` environment
+    variable, or the number of CPUs. With a single worker, the partitions are
+    created one after the other in the calling process, which works with any
+    storage (e.g. a ``DemoStorage`` in tests).
+
+    The UIDs of all the items are assigned before the partitions are handed
+    out, so links between partitions are resolved as well. Links to other
+    content created during the run (e.g. the containers of standalone files)
+    are resolved by refreshing their items in the final phase. If a partition
+    fails, the others are still committed, and the final phase (refresh, site
+    root and translations) is skipped. Running the import again completes it.
+
+    ``temp_enable_content_types`` are globally allowed and committed before
+    the workers start, and disallowed again at the end.
+
+    :param db_factory: Returns the ``ZODB.DB`` to use, it is called once in
+                       the calling process and once in each worker.
+    :param site_path: Physical path of the Plone site, e.g. ``/Plone``.
+    :param mp_context: The ``multiprocessing`` context of the workers,
+                       ``fork`` by default.
+    :returns: The result of each partition.
+    """
+    if workers is None:
+        workers = int(os.environ.get("CREATOR_IMPORT_WORKERS", os.cpu_count() or 1))
+    if commit_policy is None:
+        commit_policy = CommitPolicy(subtree=True)
+    inputs = scan_folder(pathlib.Path(folder_name), exclude)
+    report = preload(inputs.paths, base_image_path)
+    report.log(logger, strict=fail_on_load_errors)
+
+    db = db_factory()
+    with open_site(db, site_path, temp_enable_content_types) as portal:
+        import_context = ImportContext(portal)
+        uid_map = UIDMap(import_context.lookup, import_context.id_resolver)
+        entries = []
+        if inputs.content_json is not None:
+            # The workers assign the UIDs to the entries they create
+            for data in iter_json(inputs.content_json):
+                uid_map.add(data, "/")
+            entries = iter_json(inputs.content_json)
+        for item in report.items:
+            uid_map.add(item.structure, item.container_path, id_=item.id)
+            uid_map.assign(item.structure, item.container_path, id_=item.id)
+        partitions = partition(
+            entries,
+            report.items,
+            import_context.id_resolver.normalize,
+            custom_order=custom_order,
+            types_order=types_order,
+        )
+        uids = uid_map.as_dict()
+        # The workers see the enabled types once they are committed
+        transaction.commit()
+
+    options = dict(
+        base_image_path=base_image_path,
+        default_lang=default_lang,
+        default_wf_state=default_wf_state,
+        ignore_wf_types=ignore_wf_types,
+        do_not_edit_if_modified_after=do_not_edit_if_modified_after,
+    )
+    logger.info(f"Importing {len(partitions)} partitions with {workers} workers")
+    results = []
+    if workers <= 1 or len(partitions) <= 1:
+        for part in partitions:
+            results.append(
+                run_partition(
+                    db,
+                    site_path,
+                    part,
+                    uids,
+                    options,
+                    commit_policy,
+                    temp_enable_content_types,
+                    inputs.content_json,
+                )
+            )
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=min(workers, len(partitions)),
+            mp_context=mp_context or multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(
+                db_factory,
+                site_path,
+                uids,
+                options,
+                commit_policy,
+                temp_enable_content_types,
+                inputs.content_json,
+            ),
+        )
+        with executor:
+            futures = {
+                executor.submit(_run_in_worker, part): part for part in partitions
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:  # noqa: B902
+                    # The worker process died
+                    root = futures[future].root
+                    results.append(PartitionResult(root, error=str(e)))
+                    logger.error(f"{root} - partition failed: {e}")
+
+    failed = [result.root for result in results if result.error]
+    # Final phase, across partitions
+    with open_site(db, site_path) as portal:
+        if failed:
+            logger.error(
+                "Partitions failed: {}, refresh, site root and translations "
+                "skipped".format(", ".join(failed))
+            )
+        else:
+            lookup = ImportContext(portal).lookup
+            linked_paths = [path for result in results for path in result.linked_paths]
+            if linked_paths:
+                logger.debug("Refreshing the items with unresolved internal links...")
+            for path in linked_paths:
+                obj = lookup.get(path)
+                if obj is not None:
+                    refresh_object(obj)
+            if inputs.siteroot is not None:
+                modify_siteroot(load_json(inputs.siteroot))
+            if inputs.translations is not None:
+                link_translations(inputs.translations, lookup=lookup)
+        for content_type in temp_enable_content_types:
+            disable_content_type(portal, content_type)
+        transaction.commit()
+    if not failed:
+        logger.info(
+            "Imported {} objects".format(sum(len(result.paths) for result in results))
+        )
+    return results
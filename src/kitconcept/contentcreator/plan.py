@@ -0,0 +1,236 @@
+"""Plan of an import run, computed without creating or editing anything."""
+from .context import ImportContext
+from .images import get_dummy_fields
+from .images import get_local_fields
+from .scales import get_scale_infos
+from .scheduler import Item
+from contextlib import contextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+from DateTime import DateTime
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+
+import csv
+import json
+import os
+import pathlib
+import transaction
+
+
+@dataclass
+class PlannedAction:
+    """What the import would do with the object at ``path``.
+
+    ``action`` is ``create``, ``edit``, ``skip`` or ``link`` (a translation).
+    """
+
+    path: str
+    action: str
+    portal_type: Optional[str] = None
+    images: int = 0
+    reason: str = ""
+
+
+def get_scales_per_image() -> int:
+    """Number of scales generated for each image field of a created object."""
+    if os.environ.get("CREATOR_SKIP_SCALES"):
+        return 0
+    # The named scales and the one of the original size (see ScaleEngine)
+    return len(get_scale_infos()) + 1
+
+
+def count_images(data: dict) -> int:
+    return len(get_dummy_fields(data.get("set_dummy_image"), "image")) + len(
+        get_local_fields(data.get("set_local_image"), "image")
+    )
+
+
+class ImportPlan:
+    """Actions an import run would take, one per path.
+
+    The inputs are compared with the existing content with read-only lookups,
+    the objects the import would create are tracked by path, so their
+    children are planned as created as well.
+
+    :param do_not_edit_if_modified_after: Like the option of the runner, it
+                                          only applies to the items it is
+                                          called with, not to their items.
+    :param scales_per_image: Defaults to :func:`get_scales_per_image`.
+    """
+
+    def __init__(
+        self,
+        import_context: Optional[ImportContext] = None,
+        do_not_edit_if_modified_after=None,
+        scales_per_image: Optional[int] = None,
+    ):
+        if import_context is None:
+            import_context = ImportContext()
+        if scales_per_image is None:
+            scales_per_image = get_scales_per_image()
+        self.lookup = import_context.lookup
+        self.id_resolver = import_context.id_resolver
+        self.do_not_edit_if_modified_after = do_not_edit_if_modified_after
+        self.scales_per_image = scales_per_image
+        self.actions: List[PlannedAction] = []
+        self.missing_containers: List[str] = []
+        self._created: Set[str] = set()
+
+    def exists(self, path: str) -> bool:
+        """Whether an object exists at ``path`` or is planned to be created."""
+        key = self.lookup.get_key(path)
+        return key in self._created or self.lookup.get(key) is not None
+
+    def skip(self, path: str, reason: str, portal_type: Optional[str] = None):
+        self.actions.append(PlannedAction(path, "skip", portal_type, reason=reason))
+
+    def add_siteroot(self, root_info: Optional[dict] = None):
+        self.actions.append(PlannedAction("/", "edit", "Plone Site"))
+
+    def add_item(self, item: Item):
+        """Plan a standalone JSON file and the containers it needs."""
+        segments = item.container_path.strip("/").split("/")
+        for index in range(len(segments)):
+            path = "/" + "/".join(segments[: index + 1])
+            if path != "/" and not self.exists(path):
+                self.missing_containers.append(path)
+                self._created.add(path)
+                self.actions.append(
+                    PlannedAction(path, "create", "Folder", reason="missing container")
+                )
+        self.add_structure(item.structure, item.container_path, id_=item.id)
+
+    def add_structure(
+        self, data: dict, container_path: str, id_=None, check_modified=True
+    ):
+        """Plan an item of a content structure and its items, like the runner."""
+        container_key = self.lookup.get_key(container_path)
+        container = None
+        if container_key not in self._created:
+            container = self.lookup.get(container_key)
+        id_ = id_ or data.get("id")
+        if not id_ and container is not None:
+            id_ = self.id_resolver.resolve(data, container)
+        elif not id_ and data.get("title"):
+            id_ = self.id_resolver.normalize(data["title"])
+        path = container_key.rstrip("/") + "/" + (id_ or "")
+        type_ = data.get("@type")
+        if not type_:
+            self.skip(path, "property '@type' is required")
+            return
+
+        obj = None
+        if container is not None and id_:
+            obj = self.lookup.get(path)
+        if obj is None:
+            images = count_images(data)
+            self.actions.append(PlannedAction(path, "create", type_, images=images))
+            self._created.add(path)
+        elif (
+            check_modified
+            and self.do_not_edit_if_modified_after is not None
+            and DateTime(obj.modification_date)
+            > DateTime(self.do_not_edit_if_modified_after)
+        ):
+            self.skip(path, "modified after do_not_edit_if_modified_after", type_)
+            return
+        else:
+            self.actions.append(
+                PlannedAction(path, "edit", type_, images=count_images(data))
+            )
+        for child in data.get("items", []):
+            # The runner does not pass the option on to the items
+            self.add_structure(child, path, check_modified=False)
+
+    def add_translations(self, translation_map: pathlib.Path):
+        with translation_map.open("r", newline="") as f:
+            reader = csv.reader(f)
+            next(reader)  # skip header
+            for canonical_path, translation_path in reader:
+                missing = [
+                    path
+                    for path in (canonical_path, translation_path)
+                    if not self.exists(path)
+                ]
+                if missing:
+                    self.skip(translation_path, "not found: " + ", ".join(missing))
+                else:
+                    self.actions.append(
+                        PlannedAction(
+                            translation_path,
+                            "link",
+                            reason=f"translation of {canonical_path}",
+                        )
+                    )
+
+    def summary(self) -> dict:
+        counts: Dict[str, int] = dict.fromkeys(("create", "edit", "skip", "link"), 0)
+        images = 0
+        scaled = 0
+        for action in self.actions:
+            counts[action.action] += 1
+            images += action.images
+            if action.action == "create":
+                # Scales are only generated for created objects
+                scaled += action.images
+        return dict(
+            counts,
+            images=images,
+            scales=scaled * self.scales_per_image,
+            missing_containers=self.missing_containers,
+        )
+
+    def report(self) -> dict:
+        """Return the summary and the actions as a JSON serializable mapping."""
+        return {
+            "summary": self.summary(),
+            "actions": [asdict(action) for action in self.actions],
+        }
+
+    def write(self, path):
+        """Write the report as JSON to ``path``."""
+        with pathlib.Path(path).open("w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def log(self, logger):
+        for action in self.actions:
+            reason = f" ({action.reason})" if action.reason else ""
+            logger.info(f"{action.path} - would {action.action}{reason}")
+        summary = self.summary()
+        logger.info(
+            "Plan: {create} to create, {edit} to edit, {skip} skipped, {link} "
+            "translations, {images} images, {scales} scales".format(**summary)
+        )
+        if summary["missing_containers"]:
+            logger.info(
+                "Missing containers: " + ", ".join(summary["missing_containers"])
+            )
+
+
+def plan_structure(
+    container,
+    content_structure: List[dict],
+    do_not_edit_if_modified_after=None,
+    import_context: Optional[ImportContext] = None,
+) -> ImportPlan:
+    """Plan what ``create_item_runner`` would do with ``content_structure``."""
+    plan = ImportPlan(
+        import_context, do_not_edit_if_modified_after=do_not_edit_if_modified_after
+    )
+    container_path = "/".join(container.getPhysicalPath())
+    for data in content_structure:
+        plan.add_structure(data, container_path)
+    return plan
+
+
+@contextmanager
+def rolled_back():
+    """Undo the changes of the block to the ZODB (e.g. of the manifest)."""
+    savepoint = transaction.savepoint()
+    try:
+        yield
+    finally:
+        savepoint.rollback()
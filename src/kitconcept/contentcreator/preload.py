@@ -0,0 +1,136 @@
+"""Loading and validation of the standalone JSON files of a content folder."""
+from .images import get_local_fields
+from .scheduler import Item
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import json
+import os
+import pathlib
+
+
+LOCAL_FILE_KEYS = (("set_local_image", "image"), ("set_local_file", "file"))
+
+
+class LoadError(ValueError):
+    """Standalone JSON files of a content folder could not be loaded."""
+
+
+@dataclass
+class LoadReport:
+    """Items of the files which could be loaded, and the errors of the others."""
+
+    items: List[Item] = field(default_factory=list)
+    errors: Dict[pathlib.Path, List[str]] = field(default_factory=dict)
+
+    def log(self, logger, strict=False):
+        """Log the errors of all the files, which are skipped.
+
+        :param strict: Raise instead of skipping them.
+        :raises LoadError: If there are errors and ``strict`` is set.
+        """
+        for path, messages in self.errors.items():
+            for message in messages:
+                logger.error(f'Error in file structure: "{path}": {message}')
+        if self.errors:
+            message = "{} of {} files could not be loaded".format(
+                len(self.errors), len(self.errors) + len(self.items)
+            )
+            if strict:
+                raise LoadError(message)
+            logger.warning(f"{message}, skipped")
+
+
+def validate_filename(path: pathlib.Path) -> List[str]:
+    """Check that the container of a file can be derived from its name."""
+    if "" in path.stem.split("."):
+        return ["empty segment in the dotted filename"]
+    return []
+
+
+def validate_structure(data, base_image_path, label: str) -> List[str]:
+    """Check the structure of an item and its items before creating them.
+
+    :returns: The errors, prefixed with ``label`` (the path of the item).
+    """
+    if not isinstance(data, dict):
+        return [f"{label}: not a JSON object"]
+    errors = []
+    type_ = data.get("@type")
+    if not type_ or not isinstance(type_, str):
+        errors.append(f"{label}: property '@type' is required")
+    id_ = data.get("id")
+    if id_ is not None and (not id_ or not isinstance(id_, str) or "/" in id_):
+        errors.append(f"{label}: invalid id {id_!r}")
+    for key, default in LOCAL_FILE_KEYS:
+        for filename in get_local_fields(data.get(key), default).values():
+            if not os.path.isfile(os.path.join(base_image_path, filename)):
+                errors.append(f"{label}: {key} file not found: {filename}")
+    items = data.get("items", [])
+    if not isinstance(items, list):
+        errors.append(f"{label}: 'items' must be a list")
+        return errors
+    for index, child in enumerate(items):
+        child_id = index
+        if isinstance(child, dict):
+            child_id = child.get("id") or child.get("title") or index
+        errors.extend(validate_structure(child, base_image_path, f"{label}/{child_id}"))
+    return errors
+
+
+def load_file(path: pathlib.Path, base_image_path) -> Tuple[Optional[dict], List[str]]:
+    """Parse and validate a standalone JSON file.
+
+    This runs in a worker process of :func:`preload`, so it must not touch
+    the ZODB.
+
+    :returns: The structure (``None`` if the file could not be parsed) and
+              its errors.
+    """
+    try:
+        structure = json.loads(path.read_text())
+    except (ValueError, OSError) as e:
+        return None, [str(e)]
+    errors = validate_filename(path)
+    if not errors:
+        label = path.name
+        if isinstance(structure, dict):
+            label = Item(path, structure).plone_path
+        errors = validate_structure(structure, base_image_path, label)
+    return structure, errors
+
+
+def preload(paths: List[pathlib.Path], base_image_path, workers=None) -> LoadReport:
+    """Load and validate standalone JSON files before any content is created.
+
+    The files are parsed in a pool of processes of ``workers`` (default: the
+    ``CREATOR_LOAD_WORKERS`` environment variable, or 1, which loads them
+    serially in the calling thread).
+
+    :returns: The items of the valid files, in the order of ``paths``, and
+              the errors of the other ones.
+    """
+    if workers is None:
+        workers = int(os.environ.get("CREATOR_LOAD_WORKERS", 1))
+    base_image_paths = [base_image_path] * len(paths)
+    if workers <= 1 or len(paths) <= 1:
+        results = map(load_file, paths, base_image_paths)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(paths) // (workers * 4))
+            results = list(
+                executor.map(load_file, paths, base_image_paths, chunksize=chunksize)
+            )
+
+    report = LoadReport()
+    for path, (structure, errors) in zip(paths, results):
+        if errors:
+            report.errors[path] = errors
+        else:
+            report.items.append(Item(path, structure))
+    return report
@@ -0,0 +1,107 @@
+"""cProfile and tracemalloc profiles of an import run.
+
+Set the ``CREATOR_PROFILE`` environment variable to a directory to profile
+``content_creator_from_folder``. Each run writes to a new subdirectory:
+
+- ``<n>-<phase>.pstats``: cProfile statistics of each phase
+- ``import.pstats``: the statistics of all the phases together
+- ``<n>-<phase>.memory.txt``: top allocations of each phase, if
+  ``CREATOR_PROFILE_MEMORY`` is set as well (tracemalloc)
+
+The ``.pstats`` files can be read with ``python -m pstats`` or snakeviz.
+"""
+from .utils import logger
+from .utils import PROFILE
+from .utils import PROFILE_MEMORY
+from contextlib import contextmanager
+from contextlib import nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List
+
+import cProfile
+import pathlib
+import pstats
+import tracemalloc
+
+
+_profiler: ContextVar = ContextVar("kitconcept.contentcreator.profiler", default=None)
+
+# Number of allocation sites in the memory reports
+TOP_ALLOCATIONS = 25
+
+
+class Profiler:
+    """Profile the phases of an import run into ``directory``."""
+
+    def __init__(self, directory, memory=False):
+        self.directory = pathlib.Path(directory)
+        self.memory = memory
+        self.phases: List[pathlib.Path] = []
+        self._active = False
+
+    @contextmanager
+    def activate(self):
+        """Profile the phases entered in the block."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.memory:
+            tracemalloc.start()
+        token = _profiler.set(self)
+        try:
+            yield self
+        finally:
+            _profiler.reset(token)
+            if self.memory:
+                tracemalloc.stop()
+            if self.phases:
+                stats = pstats.Stats(*[str(path) for path in self.phases])
+                stats.dump_stats(str(self.directory / "import.pstats"))
+            logger.info(f"Profiles written to {self.directory}")
+
+    @contextmanager
+    def phase(self, name: str):
+        """Profile ``name``, unless another phase is being profiled."""
+        if self._active:
+            yield
+            return
+        self._active = True
+        prefix = "{:02d}-{}".format(len(self.phases) + 1, name)
+        snapshot = tracemalloc.take_snapshot() if self.memory else None
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._active = False
+            path = self.directory / f"{prefix}.pstats"
+            profile.dump_stats(str(path))
+            self.phases.append(path)
+            if snapshot is not None:
+                self._write_allocations(
+                    snapshot, self.directory / f"{prefix}.memory.txt"
+                )
+
+    def _write_allocations(self, before, path: pathlib.Path):
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        with path.open("w") as f:
+            f.write(f"Traced memory: {current} bytes (peak {peak} bytes)\n\n")
+            for stat in after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+
+def profile_import():
+    """Profile the import run if ``CREATOR_PROFILE`` is set."""
+    if not PROFILE:
+        return nullcontext()
+    directory = pathlib.Path(PROFILE) / datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return Profiler(directory, memory=bool(PROFILE_MEMORY)).activate()
+
+
+def profile_phase(name: str):
+    """Profile the ``name`` phase of the import run, if it is profiled."""
+    profiler = _profiler.get()
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
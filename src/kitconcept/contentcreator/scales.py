@@ -1,8 +1,17 @@
+from .timing import measure
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from kitconcept import api
+from plone.scale.storage import AnnotationStorage
 from ZODB.POSException import ConflictError
 from zope.component import getMultiAdapter
 from zope.component import getUtility
+from zope.globalrequest import getRequest
 
+import functools
 import logging
+import os
+import time
 import transaction
 
 
@@ -13,11 +22,21 @@ except ImportError:
 else:
     PLONE_5 = True  # pragma: no cover
 
+# plone.scale 4 (Plone 6) renders the scales itself and looks them up by
+# their mode, plone.scale 3 (Plone 5.2) takes a factory and a direction
+SCALE_FACTORY = not hasattr(AnnotationStorage, "pre_scale")
+
 
 logger = logging.getLogger(__name__)
 
 
-def plone_scale_generate_on_save(context, request, fieldname):
+def plone_scale_generate_on_save(context, request, fieldname, commit=True):
+    """Generate the image scales of ``fieldname``.
+
+    The transaction is committed afterwards, unless ``commit`` is false (e.g.
+    because a :class:`~kitconcept.contentcreator.transactions.Committer`
+    decides when to commit).
+    """
     try:
         images = getMultiAdapter((context, request), name="images")
         try:
@@ -25,17 +44,22 @@ def plone_scale_generate_on_save(context, request, fieldname):
         except ImportError:
             pass
         t = transaction.get()
-        for name, actual_width, actual_height in scales:
-            images.scale(fieldname, scale=name)
-        image = getattr(context, fieldname, None)
-        if image:  # REST API requires this scale to refer the original
-            width, height = image.getImageSize()
-            images.scale(fieldname, width=width, height=height, direction="thumbnail")
+        with measure("scales", context.portal_type):
+            for name, actual_width, actual_height in scales:
+                images.scale(fieldname, scale=name)
+            image = getattr(context, fieldname, None)
+            if image:  # REST API requires this scale to refer the original
+                width, height = image.getImageSize()
+                images.scale(
+                    fieldname, width=width, height=height, direction="thumbnail"
+                )
         msg = "/".join(
             filter(bool, ["/".join(context.getPhysicalPath()), "@@images", fieldname])
         )
-        t.note(msg)
-        t.commit()
+        if commit:
+            t.note(msg)
+            with measure("commit"):
+                t.commit()
     except ConflictError:
         msg = "/".join(
             filter(bool, ["/".join(context.getPhysicalPath()), "@@images", fieldname])
@@ -43,6 +67,217 @@ def plone_scale_generate_on_save(context, request, fieldname):
         logger.warning("ConflictError. Scale not generated on save: " + msg)
 
 
+def render_scales(data, sizes):
+    """Render the scales of an image.
+
+    This runs in a worker process of the :class:`ScaleEngine`, so it only
+    deals with bytes.
+
+    :param data: The original image data.
+    :type data: bytes
+    :param sizes: ``(name, width, height, direction)`` tuples, ``name`` is
+                  ``None`` for a scale that is not a named one.
+    :returns: ``(name, width, height, direction, (data, format, dimensions))``
+              tuples.
+    :rtype: list
+    """
+    from plone.scale.scale import scaleImage
+
+    return [
+        (
+            name,
+            width,
+            height,
+            direction,
+            scaleImage(data, width=width, height=height, direction=direction),
+        )
+        for name, width, height, direction in sizes
+    ]
+
+
+class ScaleEngine:
+    """Generate image scales, rendering them in a pool of processes.
+
+    The main thread reads the original image data and stores the rendered
+    scales in the scale storage of the object, the workers do the CPU bound
+    resizing. With a pool size of 1 (the default, or the
+    ``CREATOR_SCALE_WORKERS`` environment variable) the scales are generated
+    serially with :func:`plone_scale_generate_on_save`.
+    """
+
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = int(os.environ.get("CREATOR_SCALE_WORKERS", 1))
+        self.workers = workers
+        self._executor = None
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def generate(self, items, request):
+        """Generate the scales of ``(obj, fieldname)`` pairs."""
+        if self.workers <= 1:
+            for obj, fieldname in items:
+                plone_scale_generate_on_save(obj, request, fieldname, commit=False)
+            return
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        sizes = [
+            (name, width, height, "thumbnail")
+            for name, width, height in get_scale_infos()
+        ]
+        futures = {}
+        for obj, fieldname in items:
+            image = getattr(obj, fieldname, None)
+            if not image:
+                continue
+            if image.contentType == "image/svg+xml":
+                # Vector images are not resized
+                plone_scale_generate_on_save(obj, request, fieldname, commit=False)
+                continue
+            # REST API requires this scale to refer the original
+            width, height = image.getImageSize()
+            future = self._executor.submit(
+                render_scales, image.data, sizes + [(None, width, height, "thumbnail")]
+            )
+            futures[future] = (obj, fieldname)
+
+        for future in as_completed(futures):
+            obj, fieldname = futures[future]
+            try:
+                with measure("scales.pool"):
+                    scales = future.result()
+            except Exception as e:  # noqa: B902
+                path = "/".join(obj.getPhysicalPath())
+                logger.warning(f"{path} - could not render scales in a worker: {e}")
+                plone_scale_generate_on_save(obj, request, fieldname, commit=False)
+                continue
+            with measure("scales", obj.portal_type):
+                store_scales(obj, request, fieldname, scales)
+
+
+def store_scales(context, request, fieldname, scales):
+    """Store scales rendered by :func:`render_scales` in the scale storage.
+
+    The parameters are the same that ``@@images`` uses, so the scales are
+    found when they are requested later.
+    """
+    images = getMultiAdapter((context, request), name="images")
+    image = getattr(context, fieldname)
+    storage = AnnotationStorage(context, functools.partial(images.modified, fieldname))
+    for name, width, height, direction, (data, format_, dimensions) in scales:
+        value = image.__class__(
+            data,
+            contentType=f"image/{format_.lower()}",
+            filename=image.filename,
+        )
+        if SCALE_FACTORY:
+            result = (value, format_, dimensions)
+            storage.scale(
+                factory=lambda result=result, **parameters: result,
+                fieldname=fieldname,
+                height=height,
+                width=width,
+                direction=direction,
+                scale=name,
+            )
+            continue
+        parameters = dict(
+            fieldname=fieldname, height=height, width=width, mode="scale", scale=name
+        )
+        if name is None:
+            # Like the scale of the original size in plone_scale_generate_on_save
+            parameters["direction"] = direction
+        # Like AnnotationStorage.generate_scale, with the rendered scale
+        uid = storage.hash_key(**parameters)
+        storage.storage[uid] = dict(
+            uid=uid,
+            key=storage.hash(**parameters),
+            data=value,
+            mimetype=value.contentType,
+            modified=storage.modified_time or int(time.time() * 1000),
+            width=dimensions[0],
+            height=dimensions[1],
+            scale=name,
+            mode="scale",
+            fieldname=fieldname,
+        )
+
+
+class ScaleQueue:
+    """Image fields whose scales are generated after the content creation.
+
+    The runner only enqueues ``(path, fieldname)`` pairs. :meth:`process`
+    then generates the scales in batches, with one commit per batch. Setting
+    the ``CREATOR_SKIP_SCALES`` environment variable turns scale generation
+    off. ``workers`` is the size of the :class:`ScaleEngine` process pool.
+    """
+
+    def __init__(self, batch_size=50, retries=3, workers=None):
+        self.batch_size = batch_size
+        self.retries = retries
+        self.engine = ScaleEngine(workers)
+        self.enabled = not os.environ.get("CREATOR_SKIP_SCALES")
+        self.pending = []
+
+    def __len__(self):
+        return len(self.pending)
+
+    def enqueue(self, obj, fieldname):
+        if self.enabled:
+            self.pending.append(("/".join(obj.getPhysicalPath()), fieldname))
+
+    def process(self):
+        """Generate the scales of all enqueued image fields."""
+        total = len(self.pending)
+        if not total:
+            return
+        portal = api.portal.get()
+        request = getRequest()
+        done = 0
+        try:
+            while self.pending:
+                batch = self.pending[: self.batch_size]
+                self._process_batch(portal, request, batch)
+                del self.pending[: self.batch_size]
+                done += len(batch)
+                logger.info(
+                    "Generated image scales for {}/{} fields ({}%)".format(
+                        done, total, done * 100 // total
+                    )
+                )
+        finally:
+            self.engine.close()
+
+    def _process_batch(self, portal, request, batch):
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                items = []
+                for path, fieldname in batch:
+                    obj = portal.unrestrictedTraverse(path, None)
+                    if obj is None:
+                        logger.warning(f"{path} - not found, scales not generated")
+                        continue
+                    logger.debug(f"{path} - generating image scales for {fieldname}")
+                    items.append((obj, fieldname))
+                self.engine.generate(items, request)
+                t = transaction.get()
+                t.note(f"Generated image scales for {len(batch)} fields")
+                with measure("commit"):
+                    t.commit()
+                return
+            except ConflictError:
+                transaction.abort()
+                if attempt > self.retries:
+                    raise
+                logger.warning("ConflictError while generating scales, retrying")
+
+
 def get_scale_infos():
     """Returns a list of (name, width, height) 3-tuples of the
     available image scales.
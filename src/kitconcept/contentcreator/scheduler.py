@@ -0,0 +1,99 @@
+"""Scheduling of the standalone JSON files of a content folder."""
+from dataclasses import dataclass
+from dataclasses import field
+from sys import maxsize
+from typing import Dict
+from typing import List
+
+import heapq
+import pathlib
+
+
+@dataclass
+class Item:
+    path: pathlib.Path
+    structure: dict
+
+    @property
+    def container_path(self) -> str:
+        """Path of the container, from the filename (de.folder.json -> /de)."""
+        return "/" + "/".join(self.path.stem.split(".")[:-1])
+
+    @property
+    def id(self) -> str:
+        """Id of the object, the one in the JSON wins over the filename."""
+        return self.structure.get("id") or self.path.stem.split(".")[-1]
+
+    @property
+    def plone_path(self) -> str:
+        return self.container_path.rstrip("/") + "/" + self.id
+
+
+@dataclass
+class WorkUnit:
+    """Items of an independent subtree, in creation order.
+
+    Work units don't depend on each other, so each of them can be committed,
+    retried (or run in parallel) on its own.
+    """
+
+    root: str
+    items: List[Item] = field(default_factory=list)
+
+
+def schedule(items: List[Item], custom_order=(), types_order=()) -> List[WorkUnit]:
+    """Split items into work units and order them for creation.
+
+    The dotted filenames form a tree: an item depends on the item of its
+    nearest ancestor path, so a parent is always created before its children.
+    Among the items that are ready to be created, these rules apply:
+
+    - lower depth in content tree first
+    - ``custom_order`` (list of filenames)
+    - ``types_order`` (list of portal types)
+    - alphabetical by filename
+
+    Items below the same top-level path (e.g. ``/de``) form a work unit.
+
+    :returns: Work units, in the order of their first item.
+    """
+
+    def sort_key(item: Item):
+        name = item.path.name
+        item_type = item.structure.get("@type", "")
+        return (
+            len(name.split(".")[:-1]),  # depth
+            custom_order.index(name) if name in custom_order else maxsize,
+            types_order.index(item_type) if item_type in types_order else maxsize,
+            name.lower(),  # alphabetical
+        )
+
+    by_path: Dict[str, Item] = {item.plone_path: item for item in items}
+    children: Dict[str, List[Item]] = {}
+    ready = []
+    for item in items:
+        parent = _get_parent(item.plone_path, by_path)
+        if parent is None:
+            heapq.heappush(ready, (sort_key(item), id(item), item))
+        else:
+            children.setdefault(parent.plone_path, []).append(item)
+
+    units: Dict[str, WorkUnit] = {}
+    while ready:
+        key, _, item = heapq.heappop(ready)
+        root = "/" + item.plone_path.strip("/").split("/")[0]
+        units.setdefault(root, WorkUnit(root)).items.append(item)
+        for child in children.pop(item.plone_path, []):
+            heapq.heappush(ready, (sort_key(child), id(child), child))
+    return list(units.values())
+
+
+def _get_parent(path: str, by_path: Dict[str, Item]):
+    """Return the item of the nearest ancestor path, if there is one."""
+    segments = path.strip("/").split("/")[:-1]
+    while segments:
+        parent = by_path.get("/" + "/".join(segments))
+        if parent is not None:
+            return parent
+        segments.pop()
+    return None
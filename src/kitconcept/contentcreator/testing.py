@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+from contextlib import ExitStack
 from kitconcept import api
 from plone.app.contenttypes.testing import PLONE_APP_CONTENTTYPES_FIXTURE
 from plone.app.multilingual.testing import PLONE_APP_MULTILINGUAL_FIXTURE
@@ -11,9 +13,22 @@ from plone.app.testing import PloneSandboxLayer
 from plone.app.testing import setRoles
 from plone.app.testing import TEST_USER_ID
 from plone.app.testing import TEST_USER_NAME
+from plone.dexterity.interfaces import IDexterityContent
 from plone.testing.zope import WSGI_SERVER_FIXTURE
+from Products.CMFCore.CMFCatalogAware import CatalogAware
+from Products.CMFPlone.CatalogTool import CatalogTool
+from transaction._transaction import Status
+from unittest import mock
+from ZODB.Connection import Connection
+from zope.component import _api as component_api
+from zope.interface.interface import adapter_hooks
+from zope.interface.registry import Components
+from zope.lifecycleevent.interfaces import IObjectAddedEvent
 
+import functools
 import kitconcept.contentcreator
+import transaction
+import zope.event
 
 
 class ContentcreatorCoreLayer(PloneSandboxLayer):
@@ -36,6 +51,108 @@ class ContentcreatorCoreLayer(PloneSandboxLayer):
 CONTENTCREATOR_CORE_FIXTURE = ContentcreatorCoreLayer()
 
 
+# Methods of the component registries which look up an adapter. They don't
+# call each other, getAdapter calls the adapter registry directly.
+ADAPTER_LOOKUPS = ("getAdapter", "queryAdapter", "getMultiAdapter", "queryMultiAdapter")
+
+
+class OperationCounter:
+    """Count the expensive operations done while the counter is active.
+
+    - ``events``: event notifications
+    - ``commits``: committed transactions
+    - ``objects``: ZODB objects registered as modified
+    - ``reindex``: ``indexObject`` and ``reindexObject`` calls of content
+    - ``catalog``: objects actually cataloged, after the indexing queue of
+      CMFCore merged the calls above
+    - ``adapters``: adapter lookups, ``IFoo(obj)`` and the ``getAdapter``,
+      ``queryAdapter``, ``getMultiAdapter`` and ``queryMultiAdapter``
+      functions of ``zope.component`` and methods of the component registries
+    - ``added``: content objects added
+
+    Unlike times, the counts don't depend on the machine, so tests can assert
+    budgets per added object (see :meth:`per_item`).
+    """
+
+    KEYS = ("events", "commits", "objects", "reindex", "catalog", "adapters", "added")
+
+    def __init__(self):
+        self.counts = dict.fromkeys(self.KEYS, 0)
+        # Objects registered in each committed transaction
+        self.transactions = []
+        self._objects_at_start = 0
+
+    def __getitem__(self, key):
+        return self.counts[key]
+
+    def per_item(self, key: str) -> float:
+        """The count of ``key`` per added content object."""
+        return self.counts[key] / max(self.counts["added"], 1)
+
+    def report(self) -> dict:
+        return dict(
+            self.counts,
+            per_item={key: round(self.per_item(key), 1) for key in self.KEYS},
+            transactions=self.transactions,
+        )
+
+    @contextmanager
+    def activate(self):
+        """Count the operations done in the block."""
+        with ExitStack() as stack:
+            stack.enter_context(self._count(Connection, "register", "objects"))
+            stack.enter_context(self._count(CatalogAware, "indexObject", "reindex"))
+            stack.enter_context(self._count(CatalogAware, "reindexObject", "reindex"))
+            stack.enter_context(self._count(CatalogTool, "catalog_object", "catalog"))
+            # The getAdapter and queryAdapter functions of zope.component
+            # without a context use its adapter hook, the others the registry
+            stack.enter_context(self._count(component_api, "adapter_hook", "adapters"))
+            for name in ADAPTER_LOOKUPS:
+                stack.enter_context(self._count(Components, name, "adapters"))
+            adapter_hooks.insert(0, self._adapter_hook)
+            stack.callback(adapter_hooks.remove, self._adapter_hook)
+            zope.event.subscribers.append(self._notified)
+            stack.callback(zope.event.subscribers.remove, self._notified)
+            transaction.manager.registerSynch(self)
+            stack.callback(transaction.manager.unregisterSynch, self)
+            yield self
+
+    def _count(self, cls, name: str, key: str):
+        original = getattr(cls, name)
+
+        @functools.wraps(original)
+        def counting(*args, **kwargs):
+            self.counts[key] += 1
+            return original(*args, **kwargs)
+
+        return mock.patch.object(cls, name, counting)
+
+    def _adapter_hook(self, interface, obj):
+        # Only counts, the lookup is done by the hook of zope.component
+        self.counts["adapters"] += 1
+
+    def _notified(self, event):
+        self.counts["events"] += 1
+        if IObjectAddedEvent.providedBy(event) and IDexterityContent.providedBy(
+            event.object
+        ):
+            self.counts["added"] += 1
+
+    # Transaction synchronizer
+
+    def newTransaction(self, txn):
+        pass
+
+    def beforeCompletion(self, txn):
+        pass
+
+    def afterCompletion(self, txn):
+        if txn.status == Status.COMMITTED:
+            self.counts["commits"] += 1
+            self.transactions.append(self.counts["objects"] - self._objects_at_start)
+        self._objects_at_start = self.counts["objects"]
+
+
 CONTENTCREATOR_CORE_INTEGRATION_TESTING = IntegrationTesting(
     bases=(CONTENTCREATOR_CORE_FIXTURE,),
     name="ContentcreatorCoreLayer:IntegrationTesting",
@@ -0,0 +1,118 @@
+"""Import benchmarks, run with ``make benchmark``.
+
+They are skipped unless the ``CREATOR_BENCHMARK`` environment variable is set.
+The results are compared with the baselines in ``CREATOR_BENCHMARK_BASELINES``
+(default: ``benchmarks.json`` next to this file). Set
+``CREATOR_BENCHMARK_UPDATE`` to write the results as the new baselines.
+"""
+from kitconcept.contentcreator.benchmark import check_regression
+from kitconcept.contentcreator.benchmark import generate_folder
+from kitconcept.contentcreator.benchmark import load_baselines
+from kitconcept.contentcreator.benchmark import run_scenario
+from kitconcept.contentcreator.benchmark import Scenario
+from kitconcept.contentcreator.benchmark import SCENARIOS
+from kitconcept.contentcreator.benchmark import write_baselines
+from kitconcept.contentcreator.parallel import open_site
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+from kitconcept.contentcreator.utils import logger
+from plone.app.multilingual.browser.setup import SetupMultilingualSite
+from plone.app.multilingual.setuphandlers import enable_translatable_behavior
+from plone.testing import zodb
+from Products.CMFCore.utils import getToolByName
+
+import os
+import tempfile
+import transaction
+import unittest
+
+
+BENCHMARK = os.environ.get("CREATOR_BENCHMARK")
+BASELINES = os.environ.get(
+    "CREATOR_BENCHMARK_BASELINES",
+    os.path.join(os.path.dirname(__file__), "benchmarks.json"),
+)
+UPDATE = os.environ.get("CREATOR_BENCHMARK_UPDATE")
+
+
+@unittest.skipUnless(BENCHMARK, "set CREATOR_BENCHMARK to run the benchmarks")
+class BenchmarkTestCase(unittest.TestCase):
+
+    # The images scenario commits its scales
+    layer = CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        self.site_path = "/".join(self.portal.getPhysicalPath())
+        language_tool = getToolByName(self.portal, "portal_languages")
+        language_tool.addSupportedLanguage("de")
+        language_tool.addSupportedLanguage("en")
+        SetupMultilingualSite(self.portal).setupSite(self.portal)
+        enable_translatable_behavior(self.portal)
+        transaction.commit()
+
+    def run_isolated(self, scenario, path):
+        """Run ``scenario`` in a storage of its own, on top of the test's.
+
+        Each scenario starts from the same empty site, whatever the
+        scenarios before it created or committed.
+        """
+        db = zodb.stackDemoStorage(self.layer["zodbDB"], name=scenario.name)
+        try:
+            with open_site(db, self.site_path):
+                return run_scenario(scenario, path)
+        finally:
+            db.close()
+
+    def test_scenarios(self):
+        baselines = load_baselines(BASELINES)
+        results = {}
+        regressions = []
+        for scenario in SCENARIOS:
+            with tempfile.TemporaryDirectory() as path:
+                result = self.run_isolated(scenario, path)
+            results[scenario.name] = result
+            logger.info(
+                "{}: {} objects, {} objects/s, {} KiB peak memory".format(
+                    scenario.name,
+                    result["objects"],
+                    result["objects_per_second"],
+                    result["peak_memory"] // 1024,
+                )
+            )
+            regressions += [
+                f"{scenario.name}: {regression}"
+                for regression in check_regression(result, baselines.get(scenario.name))
+            ]
+        if UPDATE:
+            write_baselines(BASELINES, results)
+        self.assertEqual([], regressions)
+        transaction.begin()
+        self.assertNotIn(SCENARIOS[0].name, self.portal)
+
+
+class GeneratorTestCase(unittest.TestCase):
+    def test_generate_folder(self):
+        with tempfile.TemporaryDirectory() as path:
+            objects = generate_folder(path, Scenario("tree", breadth=2, depth=2))
+            self.assertEqual(["content.json"], os.listdir(path))
+        # Root folder, 2 documents, 2 subfolders with 2 documents each
+        self.assertEqual(9, objects)
+
+    def test_translations(self):
+        with tempfile.TemporaryDirectory() as path:
+            generate_folder(path, Scenario("tree", depth=1, translations=2))
+            with open(os.path.join(path, "translations.csv")) as f:
+                lines = f.read().splitlines()
+        self.assertEqual(["/de/page-0", "/en/page-0"], lines[1].split(","))
+
+    def test_check_regression(self):
+        baseline = {
+            "scenario": {"name": "small"},
+            "objects_per_second": 100,
+            "peak_memory": 1000,
+        }
+        result = dict(baseline, objects_per_second=90, peak_memory=1100)
+        self.assertEqual([], check_regression(result, baseline))
+        result = dict(baseline, objects_per_second=50, peak_memory=2000)
+        self.assertEqual(2, len(check_regression(result, baseline)))
+        self.assertEqual([], check_regression(result, None))
@@ -0,0 +1,137 @@
+from kitconcept import api
+from kitconcept.contentcreator.creator import content_creator_from_folder
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from kitconcept.contentcreator.testing import OperationCounter
+from kitconcept.contentcreator.transactions import CommitPolicy
+from plone.app.multilingual.browser.setup import SetupMultilingualSite
+from plone.app.multilingual.setuphandlers import enable_translatable_behavior
+from plone.uuid.interfaces import IUUID
+from Products.CMFCore.utils import getToolByName
+from zope.component import getMultiAdapter
+from zope.component import getSiteManager
+from zope.component import queryAdapter
+from zope.interface import Interface
+
+import os
+import unittest
+
+
+# Operations per created item of each test folder: the measured counts and a
+# margin of about 8%. A regression like an extra reindex of every object
+# exceeds them. Lower them when an import got cheaper, the failure message
+# shows the actual counts.
+BUDGETS = {
+    "content": {
+        "events": 35,
+        "objects": 150,
+        "reindex": 4.5,
+        "catalog": 2,
+        "adapters": 525,
+    },
+    "content_with_translations": {
+        "events": 46,
+        "objects": 95,
+        "reindex": 6,
+        "catalog": 2.5,
+        "adapters": 600,
+    },
+}
+
+# ZODB objects registered per commit, when committing after each object
+OBJECTS_PER_COMMIT = 300
+
+
+class OperationCounterTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+
+    def test_counts(self):
+        counter = OperationCounter()
+        with counter.activate():
+            with api.env.adopt_roles(["Manager"]):
+                api.content.create(self.portal, type="Document", id="doc")
+        self.assertEqual(1, counter["added"])
+        self.assertEqual(0, counter["commits"])
+        for key in ("events", "objects", "reindex", "adapters"):
+            self.assertGreater(counter[key], 0, key)
+
+    def test_adapter_lookups(self):
+        request = self.layer["request"]
+        counter = OperationCounter()
+        with counter.activate():
+            getMultiAdapter((self.portal, request), name="plone_portal_state")
+            getSiteManager().getMultiAdapter(
+                (self.portal, request), Interface, name="plone_portal_state"
+            )
+            queryAdapter(self.portal, IUUID)
+        self.assertEqual(3, counter["adapters"])
+
+    def test_inactive(self):
+        counter = OperationCounter()
+        with counter.activate():
+            pass
+        with api.env.adopt_roles(["Manager"]):
+            api.content.create(self.portal, type="Document", id="doc")
+        self.assertEqual(dict.fromkeys(OperationCounter.KEYS, 0), counter.counts)
+
+
+class BudgetTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+
+    def assertWithinBudgets(self, counter, folder_name):
+        self.assertGreater(counter["added"], 0)
+        for key, budget in BUDGETS[folder_name].items():
+            self.assertLessEqual(counter.per_item(key), budget, counter.report())
+
+    def test_content(self):
+        path = os.path.join(os.path.dirname(__file__), "content")
+        counter = OperationCounter()
+        with counter.activate():
+            with api.env.adopt_roles(["Manager"]):
+                content_creator_from_folder(folder_name=path)
+        self.assertWithinBudgets(counter, "content")
+        # Without a commit policy, the caller commits
+        self.assertEqual(0, counter["commits"])
+
+    def test_content_with_translations(self):
+        language_tool = getToolByName(self.portal, "portal_languages")
+        language_tool.addSupportedLanguage("de")
+        language_tool.addSupportedLanguage("en")
+        SetupMultilingualSite(self.portal).setupSite(self.portal)
+        enable_translatable_behavior(self.portal)
+
+        path = os.path.join(os.path.dirname(__file__), "content_with_translations")
+        counter = OperationCounter()
+        with counter.activate():
+            with api.env.adopt_roles(["Manager"]):
+                content_creator_from_folder(folder_name=path)
+        self.assertWithinBudgets(counter, "content_with_translations")
+
+
+class CommitBudgetTestCase(unittest.TestCase):
+
+    # Commits for real, each test has its own storage
+    layer = CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+
+    def test_objects_per_commit(self):
+        path = os.path.join(os.path.dirname(__file__), "content")
+        counter = OperationCounter()
+        with counter.activate():
+            with api.env.adopt_roles(["Manager"]):
+                content_creator_from_folder(
+                    folder_name=path, commit_policy=CommitPolicy(objects=1)
+                )
+        # One commit per object and a final one
+        self.assertLessEqual(counter["commits"], counter["added"] + 1)
+        self.assertTrue(counter.transactions)
+        self.assertLessEqual(
+            max(counter.transactions), OBJECTS_PER_COMMIT, counter.report()
+        )
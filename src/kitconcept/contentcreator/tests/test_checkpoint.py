@@ -0,0 +1,192 @@
+from kitconcept import api
+from kitconcept.contentcreator.checkpoint import Checkpoint
+from kitconcept.contentcreator.context import ImportContext
+from kitconcept.contentcreator.creator import content_creator_from_folder
+from kitconcept.contentcreator.creator import FolderImport
+from kitconcept.contentcreator.creator import ImportInputs
+from kitconcept.contentcreator.plan import ImportPlan
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from kitconcept.contentcreator.transactions import CommitPolicy
+from types import SimpleNamespace
+from unittest import mock
+
+import json
+import os
+import pathlib
+import tempfile
+import transaction
+import unittest
+
+
+class CheckpointTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name) / "checkpoint.json"
+        transaction.begin()
+        self.addCleanup(transaction.abort)
+
+    def test_marks_are_saved_on_commit(self):
+        checkpoint = Checkpoint(self.path)
+        self.assertFalse(checkpoint.resumed)
+        checkpoint.mark("de.json")
+        self.assertFalse(self.path.exists())
+        transaction.commit()
+        resumed = Checkpoint(self.path)
+        self.assertTrue(resumed.resumed)
+        self.assertTrue(resumed.is_done("de.json"))
+
+    def test_aborted_marks_are_dropped(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.mark("de.json")
+        transaction.abort()
+        checkpoint.mark("en.json")
+        transaction.commit()
+        self.assertFalse(Checkpoint(self.path).is_done("de.json"))
+        self.assertTrue(Checkpoint(self.path).is_done("en.json"))
+
+    def test_finished_run_starts_over(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.mark("de.json")
+        transaction.commit()
+        checkpoint.finish()
+        resumed = Checkpoint(self.path)
+        self.assertFalse(resumed.resumed)
+        self.assertFalse(resumed.is_done("de.json"))
+
+    def test_scales_are_resumed(self):
+        queue = SimpleNamespace(enabled=True, pending=[])
+        checkpoint = Checkpoint(self.path)
+        checkpoint.attach(queue)
+        queue.pending.append(("/plone/image", "image"))
+        checkpoint.mark("image.json")
+        transaction.commit()
+
+        resumed_queue = SimpleNamespace(enabled=True, pending=[])
+        Checkpoint(self.path).attach(resumed_queue)
+        self.assertEqual([("/plone/image", "image")], resumed_queue.pending)
+
+    def test_linked_paths_are_resumed(self):
+        linked_paths = []
+        checkpoint = Checkpoint(self.path)
+        checkpoint.attach(SimpleNamespace(enabled=True, pending=[]), linked_paths)
+        linked_paths.append("/plone/linking")
+        checkpoint.mark("linking.json")
+        transaction.commit()
+
+        resumed_paths = []
+        resumed = Checkpoint(self.path)
+        resumed.attach(SimpleNamespace(enabled=True, pending=[]), resumed_paths)
+        self.assertEqual(["/plone/linking"], resumed_paths)
+
+
+class ResumeTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.checkpoint_path = os.path.join(tmp.name, "checkpoint.json")
+        self.folder = os.path.join(os.path.dirname(__file__), "content")
+
+    def test_resume(self):
+        # A previous run committed the folder and the first document
+        with open(self.checkpoint_path, "w") as f:
+            json.dump(
+                {
+                    "complete": False,
+                    "done": ["content.json/a-folder", "a-folder.a-document-1.json"],
+                },
+                f,
+            )
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(
+                folder_name=self.folder, checkpoint_path=self.checkpoint_path
+            )
+        folder = self.portal["a-folder"]
+        # The folder item was skipped, its container was created for the others
+        self.assertNotEqual("Test Folder", folder.title)
+        self.assertNotIn("a-document-1", folder.objectIds())
+        self.assertIn("a-document-2", folder.objectIds())
+        with open(self.checkpoint_path) as f:
+            self.assertTrue(json.load(f)["complete"])
+
+    def test_inputs_with_errors_are_not_marked(self):
+        import_context = ImportContext(self.portal)
+        checkpoint = Checkpoint(self.checkpoint_path)
+        inputs = ImportInputs(
+            pathlib.Path(self.folder), None, import_context, checkpoint=checkpoint
+        )
+        with mock.patch.object(checkpoint, "mark") as mark:
+            self.assertFalse(inputs.should_skip("failed.json", "/failed"))
+            import_context.errors.append("Can not create object failed")
+            inputs.record("failed.json")
+            self.assertFalse(inputs.should_skip("created.json", "/created"))
+            inputs.record("created.json")
+        mark.assert_called_once_with("created.json")
+
+    def test_dry_run_marks_nothing(self):
+        import_context = ImportContext(self.portal)
+        checkpoint = Checkpoint(self.checkpoint_path)
+        inputs = ImportInputs(
+            pathlib.Path(self.folder),
+            None,
+            import_context,
+            plan=ImportPlan(import_context),
+            checkpoint=checkpoint,
+        )
+        with mock.patch.object(checkpoint, "mark") as mark:
+            self.assertFalse(inputs.should_skip("created.json", "/created"))
+            inputs.record("created.json")
+        mark.assert_not_called()
+
+
+class ResumeRefreshTestCase(unittest.TestCase):
+
+    # Commits for real, each test has its own storage
+    layer = CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.checkpoint_path = os.path.join(tmp.name, "checkpoint.json")
+        self.folder = os.path.join(tmp.name, "content")
+        os.mkdir(self.folder)
+
+    def test_pending_refresh_is_resumed(self):
+        content = [
+            {
+                "id": "linking",
+                "@type": "Document",
+                "title": "Linking",
+                "blocks": {"1": {"@type": "teaser", "href": [{"@id": "/container"}]}},
+                "blocks_layout": {"items": ["1"]},
+            }
+        ]
+        with open(os.path.join(self.folder, "content.json"), "w") as f:
+            json.dump(content, f)
+        # Its container is created for it, the link is resolved by the refresh
+        with open(os.path.join(self.folder, "container.document.json"), "w") as f:
+            json.dump({"@type": "Document", "title": "Document"}, f)
+        options = dict(
+            folder_name=self.folder,
+            commit_policy=CommitPolicy(subtree=True),
+            checkpoint_path=self.checkpoint_path,
+        )
+        with api.env.adopt_roles(["Manager"]):
+            with mock.patch.object(
+                FolderImport, "refresh", side_effect=RuntimeError("crash")
+            ):
+                with self.assertRaises(RuntimeError):
+                    content_creator_from_folder(**options)
+            transaction.abort()
+            content_creator_from_folder(**options)
+
+        self.assertIn(
+            "resolveuid/{}".format(self.portal["container"].UID()),
+            json.dumps(self.portal["linking"].blocks),
+        )
@@ -0,0 +1,49 @@
+from kitconcept import api
+from kitconcept.contentcreator.context import ImportContext
+from kitconcept.contentcreator.creator import create_item_runner
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from Products.CMFCore.utils import getToolByName
+from unittest import mock
+
+import unittest
+
+
+class ImportContextTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        language_tool = getToolByName(self.portal, "portal_languages")
+        language_tool.addSupportedLanguage("de")
+        language_tool.addSupportedLanguage("en")
+        self.context = ImportContext(self.portal)
+
+    def test_language_from_path(self):
+        with api.env.adopt_roles(["Manager"]):
+            # The language root folder may exist already
+            de = self.portal.get("de") or api.content.create(
+                self.portal, type="Folder", id="de"
+            )
+            folder = api.content.create(de, type="Folder", id="folder")
+        self.assertEqual("de", self.context.get_language(folder))
+        self.assertIsNone(self.context.get_language(self.portal))
+
+    def test_site_wide_facts_are_looked_up_once(self):
+        content_structure = [
+            {
+                "@type": "Document",
+                "id": "doc-{}".format(i),
+                "title": "Document {}".format(i),
+            }
+            for i in range(5)
+        ]
+        with mock.patch.object(
+            api.addon, "get_addons_ids", wraps=api.addon.get_addons_ids
+        ) as get_addons_ids:
+            with api.env.adopt_roles(["Manager"]):
+                create_item_runner(
+                    self.portal, content_structure, import_context=self.context
+                )
+        self.assertEqual(1, get_addons_ids.call_count)
+        self.assertIn("doc-4", self.portal)
@@ -3,17 +3,22 @@ from importlib import import_module
 from kitconcept import api
 from kitconcept.contentcreator.creator import content_creator_from_folder
 from kitconcept.contentcreator.creator import create_item_runner
+from kitconcept.contentcreator.creator import iter_json
 from kitconcept.contentcreator.creator import load_json
+from kitconcept.contentcreator.creator import refresh_object
 from kitconcept.contentcreator.creator import refresh_objects_created_by_structure
+from kitconcept.contentcreator.preload import LoadError
 from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
 from plone.app.multilingual.api import get_translation_manager
 from plone.app.multilingual.browser.setup import SetupMultilingualSite
 from plone.app.multilingual.setuphandlers import enable_translatable_behavior
 from plone.app.testing import applyProfile
 from Products.CMFCore.utils import getToolByName
+from unittest import mock
 
 import json
 import os
+import tempfile
 import unittest
 
 
@@ -93,6 +98,42 @@ class CreatorTestCase(unittest.TestCase):
         self.assertTrue(self.portal["news-item-image"].image.filename, "image.png")
         self.assertTrue(self.portal["news-item-image"].image.contentType, "image/png")
 
+    def test_dummy_image_size(self):
+        content_structure = load_json("fields_image.json", __file__)
+
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.portal,
+                content_structure,
+                default_lang="en",
+                default_wf_state="published",
+                base_image_path=os.path.dirname(__file__),
+            )
+        self.assertEqual((400, 300), self.portal["an-image"].image.getImageSize())
+        self.assertEqual((800, 600), self.portal["a-sized-image"].image.getImageSize())
+        self.assertEqual(
+            self.portal["an-image"].image.data,
+            self.portal["an-image-deprecated"].image.data,
+        )
+
+    def test_identical_local_images_share_the_blob(self):
+        content_structure = load_json("fields_image.json", __file__)
+
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.portal,
+                content_structure,
+                default_lang="en",
+                default_wf_state="published",
+                base_image_path=os.path.dirname(__file__),
+            )
+        image = self.portal["another-image"].image
+        news_item_image = self.portal["news-item-image"].image
+        self.assertIsNot(image, news_item_image)
+        self.assertIs(image._blob, news_item_image._blob)
+        self.assertEqual("image.png", news_item_image.filename)
+        self.assertIsNot(image._blob, self.portal["image-svg"].image._blob)
+
     def test_file_fields(self):
         content_structure = load_json("fields_file.json", __file__)
 
@@ -347,6 +388,93 @@ class CreatorTestCase(unittest.TestCase):
 
     #     pass
 
+    def test_iter_json(self):
+        path = os.path.join(
+            os.path.dirname(__file__), "content_with_refresh", "content.json"
+        )
+        self.assertEqual(load_json(path), list(iter_json(path, chunk_size=16)))
+
+    def test_iter_json_decodes_large_items_a_few_times(self):
+        items = [{"text": "x" * 100000}, 1, {"text": "y"}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "content.json")
+            with open(path, "w") as f:
+                json.dump(items, f)
+            raw_decode = json.JSONDecoder.raw_decode
+            with mock.patch.object(
+                json.JSONDecoder, "raw_decode", autospec=True, side_effect=raw_decode
+            ) as decode:
+                self.assertEqual(items, list(iter_json(path, chunk_size=16)))
+        self.assertLess(decode.call_count, 20)
+
+    def test_content_from_folder_refreshes_structure(self):
+        path = os.path.join(os.path.dirname(__file__), "content_with_refresh")
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=path)
+
+        # The link to the document created afterwards has been resolved
+        self.assertTrue(
+            "resolveuid" in json.dumps(self.portal["a-folder"]["a-document"].blocks)
+        )
+
+    def test_links_are_resolved_without_refresh(self):
+        path = os.path.join(os.path.dirname(__file__), "content_with_refresh")
+        with mock.patch(
+            "kitconcept.contentcreator.creator.refresh_object"
+        ) as refresh_object, api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=path)
+
+        refresh_object.assert_not_called()
+        anotherdoc = self.portal["a-folder"]["anotherdoc"]
+        self.assertIn(
+            "resolveuid/{}".format(anotherdoc.UID()),
+            json.dumps(self.portal["a-folder"]["a-document"].blocks),
+        )
+
+    def test_links_to_created_containers_are_refreshed(self):
+        content = [
+            {
+                "id": "linking",
+                "@type": "Document",
+                "title": "Linking",
+                "blocks": {"1": {"@type": "teaser", "href": [{"@id": "/container"}]}},
+                "blocks_layout": {"items": ["1"]},
+            }
+        ]
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "content.json"), "w") as f:
+                json.dump(content, f)
+            # Its container is created for it, it is not one of the items
+            with open(os.path.join(path, "container.document.json"), "w") as f:
+                json.dump({"@type": "Document", "title": "Document"}, f)
+            with mock.patch(
+                "kitconcept.contentcreator.creator.refresh_object",
+                wraps=refresh_object,
+            ) as refresh, api.env.adopt_roles(["Manager"]):
+                content_creator_from_folder(folder_name=path)
+
+        refresh.assert_called_once_with(self.portal["linking"], committer=None)
+        self.assertIn(
+            "resolveuid/{}".format(self.portal["container"].UID()),
+            json.dumps(self.portal["linking"].blocks),
+        )
+
+    def test_files_which_can_not_be_loaded_are_skipped(self):
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "README.txt"), "w") as f:
+                f.write("Not JSON")
+            with open(os.path.join(path, "document.json"), "w") as f:
+                json.dump({"@type": "Document", "title": "Document"}, f)
+            with api.env.adopt_roles(["Manager"]):
+                with self.assertRaises(LoadError):
+                    content_creator_from_folder(
+                        folder_name=path, fail_on_load_errors=True
+                    )
+                self.assertNotIn("document", self.portal)
+                content_creator_from_folder(folder_name=path)
+
+        self.assertIn("document", self.portal)
+
     def test_refresh_objects_created_by_structure(self):
         path = os.path.join(os.path.dirname(__file__), "content_with_refresh")
         with api.env.adopt_roles(["Manager"]):
@@ -0,0 +1,56 @@
+from kitconcept import api
+from kitconcept.contentcreator.creator import create_item_runner
+from kitconcept.contentcreator.ids import IdResolver
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from unittest import mock
+
+import unittest
+
+
+class IdResolverTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        self.resolver = IdResolver()
+
+    def test_id_wins(self):
+        data = {"@type": "Document", "id": "an-id", "title": "A title"}
+        self.assertEqual("an-id", self.resolver.resolve(data, self.portal))
+
+    def test_id_from_title(self):
+        data = {"@type": "Document", "title": "Über uns"}
+        self.assertEqual("uber-uns", self.resolver.resolve(data, self.portal))
+
+    def test_existing_content_is_found(self):
+        data = {"@type": "Document", "title": "A Document"}
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(self.portal, [data])
+            create_item_runner(self.portal, [data])
+        self.assertIn("a-document", self.portal)
+        self.assertNotIn("a-document-1", self.portal)
+
+    def test_no_throwaway_objects(self):
+        data = {"@type": "Document", "title": "A Document"}
+        with mock.patch.object(
+            self.resolver, "choose_name", wraps=self.resolver.choose_name
+        ) as choose_name:
+            self.resolver.resolve(data, self.portal)
+            self.resolver.resolve(data, self.portal)
+        choose_name.assert_not_called()
+
+    def test_results_are_cached_per_container(self):
+        data = {"@type": "Document", "title": "A Document"}
+        with mock.patch.object(
+            self.resolver, "normalize", wraps=self.resolver.normalize
+        ) as normalize:
+            self.resolver.resolve(data, self.portal)
+            self.resolver.resolve(data, self.portal)
+        self.assertEqual(1, normalize.call_count)
+
+    def test_clashing_title_asks_the_name_chooser(self):
+        # "title" is an attribute of the portal
+        data = {"@type": "Document", "title": "Title"}
+        with mock.patch.object(self.resolver, "choose_name", return_value="title-1"):
+            self.assertEqual("title-1", self.resolver.resolve(data, self.portal))
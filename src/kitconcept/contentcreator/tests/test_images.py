@@ -0,0 +1,90 @@
+from kitconcept.contentcreator.images import create_blob_value
+from kitconcept.contentcreator.images import get_file_digest
+from kitconcept.contentcreator.images import MimeTypeSniffer
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from plone.namedfile.file import NamedBlobFile
+from plone.namedfile.file import NamedBlobImage
+from unittest import mock
+
+import hashlib
+import os
+import shutil
+import unittest
+
+
+TESTS_PATH = os.path.dirname(__file__)
+
+
+class MimeTypeSnifferTestCase(unittest.TestCase):
+    def setUp(self):
+        self.sniffer = MimeTypeSniffer(header_size=1024)
+        patcher = mock.patch.object(
+            self.sniffer._magic, "from_buffer", wraps=self.sniffer._magic.from_buffer
+        )
+        self.from_buffer = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_content_types(self):
+        self.assertEqual(
+            "application/pdf",
+            self.sniffer.from_file(os.path.join(TESTS_PATH, "report.pdf")),
+        )
+        self.assertEqual(
+            "image/png", self.sniffer.from_file(os.path.join(TESTS_PATH, "image.png"))
+        )
+        self.assertIn(
+            "svg", self.sniffer.from_file(os.path.join(TESTS_PATH, "image.svg"))
+        )
+
+    def test_reads_the_header_only(self):
+        self.sniffer.from_file(os.path.join(TESTS_PATH, "report.pdf"))
+        self.assertEqual(1024, len(self.from_buffer.call_args[0][0]))
+
+    def test_results_are_cached(self):
+        path = os.path.join(TESTS_PATH, "image.png")
+        self.sniffer.from_file(path)
+        self.sniffer.from_file(path)
+        self.assertEqual(1, self.from_buffer.call_count)
+
+
+class BlobValueTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def test_create_file_from_local_file(self):
+        path = os.path.join(TESTS_PATH, "report.pdf")
+        value = create_blob_value(NamedBlobFile, path, "report.pdf", "application/pdf")
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data, value.data)
+        self.assertEqual(len(data), value.getSize())
+        self.assertEqual("report.pdf", value.filename)
+        # The local file is left alone
+        self.assertTrue(os.path.exists(path))
+
+    def test_create_image_from_local_file(self):
+        path = os.path.join(TESTS_PATH, "image.png")
+        value = create_blob_value(NamedBlobImage, path, "image.png", "image/png")
+        width, height = value.getImageSize()
+        self.assertTrue(width > 0 and height > 0)
+
+    def test_temporary_file_is_moved_into_the_blob(self):
+        path = os.path.join(TESTS_PATH, "report.pdf")
+        copyfile = shutil.copyfile
+        inodes = []
+
+        def copy_and_stat(src, dst):
+            copyfile(src, dst)
+            inodes.append(os.stat(dst).st_ino)
+
+        with mock.patch.object(shutil, "copyfile", side_effect=copy_and_stat):
+            value = create_blob_value(
+                NamedBlobFile, path, "report.pdf", "application/pdf"
+            )
+        self.assertEqual(inodes, [os.stat(value._blob._p_blob_uncommitted).st_ino])
+
+    def test_file_digest(self):
+        path = os.path.join(TESTS_PATH, "report.pdf")
+        with open(path, "rb") as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+        self.assertEqual(expected, get_file_digest(path, chunk_size=1000))
@@ -0,0 +1,92 @@
+from Acquisition import aq_base
+from kitconcept import api
+from kitconcept.contentcreator.context import ImportContext
+from kitconcept.contentcreator.creator import create_item_runner
+from kitconcept.contentcreator.indexing import IndexingQueue
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from unittest import mock
+
+import transaction
+import unittest
+
+
+class IndexingQueueTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        self.queue = IndexingQueue()
+        with api.env.adopt_roles(["Manager"]):
+            self.doc = api.content.create(self.portal, type="Document", id="doc")
+
+    def reindex_calls(self):
+        document_class = type(aq_base(self.doc))
+        return mock.patch.object(
+            document_class,
+            "reindexObject",
+            autospec=True,
+            side_effect=document_class.reindexObject,
+        )
+
+    def test_indexes_are_merged(self):
+        with self.reindex_calls() as reindex:
+            self.queue.reindex(self.doc, ["UID"])
+            self.queue.reindex(self.doc, ["exclude_from_nav"])
+            self.assertEqual(1, len(self.queue))
+            reindex.assert_not_called()
+            self.queue.flush()
+        reindex.assert_called_once_with(self.doc, idxs=["UID", "exclude_from_nav"])
+        self.assertEqual(0, len(self.queue))
+
+    def test_all_indexes_win(self):
+        with self.reindex_calls() as reindex:
+            self.queue.reindex(self.doc, ["UID"])
+            self.queue.reindex(self.doc)
+            self.queue.flush()
+        reindex.assert_called_once_with(self.doc)
+
+    def test_aborted_transaction(self):
+        self.queue.reindex(self.doc, ["UID"])
+        transaction.abort()
+        with self.reindex_calls() as reindex:
+            self.queue.flush()
+        reindex.assert_not_called()
+
+    def test_runner_reindexes_once(self):
+        content_structure = [
+            {
+                "@type": "Document",
+                "id": "a-document",
+                "title": "A document",
+                "UID": "0c8f5cd2a32e4b7e9b0a3e4d3a6c1f01",
+                "review_state": "published",
+                "opts": {"exclude_from_nav": True},
+            }
+        ]
+        import_context = ImportContext(self.portal, indexing_queue=self.queue)
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.portal, content_structure, import_context=import_context
+            )
+        # Effective date and exclude from nav of the same object
+        self.assertEqual(1, len(self.queue))
+        self.assertNotIn("UID", list(self.queue._pending.values())[0][1])
+        # The object has been cataloged with its UID when it was added
+        self.assertEqual(
+            api.content.get(UID="0c8f5cd2a32e4b7e9b0a3e4d3a6c1f01"),
+            self.portal["a-document"],
+        )
+
+    def test_uid_of_existing_objects_is_reindexed(self):
+        uid = "0c8f5cd2a32e4b7e9b0a3e4d3a6c1f02"
+        import_context = ImportContext(self.portal, indexing_queue=self.queue)
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.portal,
+                [{"@type": "Document", "id": "doc", "title": "A document", "UID": uid}],
+                import_context=import_context,
+            )
+        self.assertEqual({"UID"}, self.queue._pending["/plone/doc"][1])
+        self.queue.flush()
+        self.assertEqual(api.content.get(UID=uid), self.doc)
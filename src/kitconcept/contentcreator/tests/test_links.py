@@ -0,0 +1,94 @@
+from kitconcept import api
+from kitconcept.contentcreator.ids import IdResolver
+from kitconcept.contentcreator.links import has_internal_links
+from kitconcept.contentcreator.links import iter_internal_links
+from kitconcept.contentcreator.links import UIDMap
+from kitconcept.contentcreator.lookup import ContentLookup
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+import unittest
+
+
+class InternalLinksTestCase(unittest.TestCase):
+    def test_internal_links(self):
+        blocks = {
+            "1": {"@type": "teaser", "href": [{"@id": "/de/seite"}]},
+            "2": {"@type": "image", "url": "http://nohost/plone/de/bild"},
+            "3": {"@type": "slate", "plaintext": "just text"},
+            "4": {"@type": "image", "url": "https://plone.org/logo.png"},
+            "5": {"@type": "teaser", "href": "../resolveuid/0c8f5cd2a32e"},
+        }
+        self.assertEqual(
+            ["/de/seite", "http://nohost/plone/de/bild"],
+            list(iter_internal_links(blocks, "http://nohost/plone")),
+        )
+
+    def test_has_internal_links(self):
+        self.assertFalse(has_internal_links({"@type": "Folder"}))
+        self.assertFalse(
+            has_internal_links({"blocks": {"1": {"@type": "slate", "value": []}}})
+        )
+        self.assertTrue(
+            has_internal_links({"blocks": {"1": {"href": [{"@id": "/a-folder"}]}}})
+        )
+
+
+class UIDMapTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        with api.env.adopt_roles(["Manager"]):
+            self.existing = api.content.create(
+                self.portal, type="Document", id="existing"
+            )
+        self.uid_map = UIDMap(ContentLookup(self.portal), IdResolver())
+        self.data = {
+            "id": "de",
+            "@type": "Folder",
+            "items": [
+                {"@type": "Document", "title": "Über uns"},
+                {"@type": "Document", "id": "page", "UID": "a" * 32},
+            ],
+        }
+        self.uid_map.add(self.data, "/")
+        self.uid_map.add({"@type": "Document"}, "/", id_="existing")
+
+    def test_uids(self):
+        self.assertEqual("a" * 32, self.uid_map.get("/de/page"))
+        self.assertEqual(32, len(self.uid_map.get("/de/uber-uns")))
+        self.assertEqual(self.existing.UID(), self.uid_map.get("/existing"))
+        self.assertEqual(4, len(self.uid_map))
+
+    def test_assign(self):
+        self.assertNotIn("UID", self.data)
+        self.uid_map.assign(self.data, "/")
+        self.assertEqual(self.uid_map.get("/de"), self.data["UID"])
+        self.assertEqual(self.uid_map.get("/de/uber-uns"), self.data["items"][0]["UID"])
+
+    def test_resolve_links(self):
+        uid = "a" * 32
+        blocks = {
+            "1": {"@type": "teaser", "href": [{"@id": "/de/page", "title": "/de"}]},
+            "2": {"@type": "image", "url": "http://nohost/plone/de/page/@@images/a"},
+            "3": {"@type": "teaser", "href": "/de/page#section"},
+            "4": {"@type": "teaser", "href": "/en/unknown"},
+            "5": {"@type": "teaser", "href": "/de/page/not-an-item/view"},
+            "6": {"@type": "teaser", "href": "/de/page/view"},
+        }
+        self.assertEqual(
+            {
+                "1": {
+                    "@type": "teaser",
+                    "href": [{"@id": f"../resolveuid/{uid}", "title": "/de"}],
+                },
+                "2": {"@type": "image", "url": f"../resolveuid/{uid}/@@images/a"},
+                "3": {"@type": "teaser", "href": f"../resolveuid/{uid}#section"},
+                "4": {"@type": "teaser", "href": "/en/unknown"},
+                # Below an item, but not one of its views
+                "5": {"@type": "teaser", "href": "/de/page/not-an-item/view"},
+                "6": {"@type": "teaser", "href": f"../resolveuid/{uid}/view"},
+            },
+            self.uid_map.resolve_links(blocks),
+        )
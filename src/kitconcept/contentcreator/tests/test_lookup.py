@@ -0,0 +1,59 @@
+from Acquisition import aq_base
+from kitconcept import api
+from kitconcept.contentcreator.context import ImportContext
+from kitconcept.contentcreator.creator import create_item_runner
+from kitconcept.contentcreator.creator import create_object
+from kitconcept.contentcreator.lookup import ContentLookup
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from unittest import mock
+
+import unittest
+
+
+class ContentLookupTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        self.lookup = ContentLookup(self.portal)
+        with api.env.adopt_roles(["Manager"]):
+            folder = api.content.create(self.portal, type="Folder", id="folder")
+            api.content.create(folder, type="Document", id="doc")
+
+    def test_paths(self):
+        doc = self.portal["folder"]["doc"]
+        self.assertEqual(doc, self.lookup.get("/folder/doc"))
+        self.assertEqual(doc, self.lookup.get("/plone/folder/doc"))
+        self.assertEqual(doc, self.lookup.get("folder/doc/"))
+        self.assertEqual(self.portal, self.lookup.get("/"))
+        self.assertIsNone(self.lookup.get("/folder/missing"))
+        self.assertIsNone(self.lookup.get("/missing/doc"))
+
+    def test_no_acquisition(self):
+        # "folder" is acquirable from the document, but not contained in it
+        self.assertIsNone(self.lookup.get("/folder/doc/folder"))
+
+    def test_objects_are_traversed_once(self):
+        folder_class = type(aq_base(self.portal["folder"]))
+        with mock.patch.object(
+            folder_class, "_getOb", autospec=True, side_effect=folder_class._getOb
+        ) as get_ob:
+            self.lookup.get("/folder/doc")
+            calls = get_ob.call_count
+            self.lookup.get("/folder/doc")
+            self.lookup.get("/folder")
+        self.assertTrue(calls > 0)
+        self.assertEqual(calls, get_ob.call_count)
+
+    def test_created_objects_are_registered(self):
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.portal["folder"],
+                [{"@type": "Document", "id": "new", "title": "New"}],
+                import_context=ImportContext(self.portal, lookup=self.lookup),
+            )
+            create_object("/a/b/c", lookup=self.lookup)
+        self.assertIn("/folder/new", self.lookup._objects)
+        self.assertIn("/a/b", self.lookup._objects)
+        self.assertEqual(self.portal["a"]["b"]["c"], self.lookup.get("/a/b/c"))
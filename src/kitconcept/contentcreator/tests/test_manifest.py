@@ -0,0 +1,83 @@
+from kitconcept import api
+from kitconcept.contentcreator.creator import content_creator_from_folder
+from kitconcept.contentcreator.manifest import ImportManifest
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from unittest import mock
+
+import json
+import os
+import pathlib
+import tempfile
+import unittest
+
+
+class ManifestTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        self.path = os.path.join(os.path.dirname(__file__), "content")
+
+    def test_unchanged_items_are_skipped(self):
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=self.path, incremental=True)
+
+        self.portal["a-folder"]["a-document-1"].title = "the modified title"
+
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=self.path, incremental=True)
+
+        self.assertEqual(
+            self.portal["a-folder"]["a-document-1"].title, "the modified title"
+        )
+
+    def test_missing_objects_are_created_again(self):
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=self.path, incremental=True)
+            api.content.delete(self.portal["a-folder"]["a-document-1"])
+            content_creator_from_folder(folder_name=self.path, incremental=True)
+
+        self.assertIn("a-document-1", self.portal["a-folder"])
+
+    def test_changed_options_change_the_digest(self):
+        data = {"id": "a-folder", "@type": "Folder"}
+        manifest = ImportManifest(self.portal, options={"default_lang": "en"})
+        other = ImportManifest(self.portal, options={"default_lang": "de"})
+        self.assertNotEqual(
+            manifest.get_digest(data, self.path), other.get_digest(data, self.path)
+        )
+
+    def test_referenced_files_are_part_of_the_digest(self):
+        manifest = ImportManifest(self.portal)
+        data = {"id": "image", "@type": "Image", "set_local_image": "image.png"}
+        with tempfile.TemporaryDirectory() as images_path:
+            path = os.path.join(images_path, "image.png")
+            with open(path, "wb") as f:
+                f.write(b"first")
+            first = manifest.get_digest(data, images_path)
+            with open(path, "wb") as f:
+                f.write(b"second version")
+            self.assertNotEqual(first, manifest.get_digest(data, images_path))
+
+    def test_inputs_are_recorded_by_the_resolved_folder_path(self):
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=self.path, incremental=True)
+
+        entries = ImportManifest(self.portal).entries
+        folder = pathlib.Path(self.path).resolve()
+        self.assertIn(f"{folder}/a-folder.a-document-1.json", entries)
+        self.assertIn(f"{folder}/content.json/a-folder", entries)
+
+    def test_inputs_with_swallowed_errors_are_not_recorded(self):
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "a-document.json"), "w") as f:
+                json.dump(
+                    {"@type": "Document", "title": "A document", "effective": "x"}, f
+                )
+            with mock.patch("kitconcept.contentcreator.utils.CONTINUE_ON_ERROR", "1"):
+                with api.env.adopt_roles(["Manager"]):
+                    content_creator_from_folder(folder_name=path, incremental=True)
+
+            key = f"{pathlib.Path(path).resolve()}/a-document.json"
+            self.assertNotIn(key, ImportManifest(self.portal).entries)
@@ -0,0 +1,199 @@
+from contextlib import contextmanager
+from kitconcept.contentcreator.creator import disable_content_type
+from kitconcept.contentcreator.parallel import import_in_parallel
+from kitconcept.contentcreator.parallel import partition
+from kitconcept.contentcreator.scheduler import Item
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+from plone.app.multilingual.api import get_translation_manager
+from plone.app.multilingual.browser.setup import SetupMultilingualSite
+from plone.app.multilingual.setuphandlers import enable_translatable_behavior
+from Products.CMFCore.utils import getToolByName
+
+import functools
+import json
+import multiprocessing
+import os
+import pathlib
+import tempfile
+import transaction
+import unittest
+import ZEO
+
+
+def make_item(filename, **structure):
+    return Item(pathlib.Path("/tmp/content") / filename, structure)
+
+
+class PartitionTestCase(unittest.TestCase):
+    def test_partition(self):
+        entries = [
+            {"@type": "Folder", "id": "de"},
+            {"@type": "Folder", "title": "News"},
+        ]
+        items = [
+            make_item("de.a.json"),
+            make_item("de.a.b.json"),
+            make_item("en.json"),
+            make_item("news.today.json"),
+        ]
+        partitions = partition(entries, items, str.lower)
+        self.assertEqual(["/de", "/news", "/en"], [p.root for p in partitions])
+        de, news, en = partitions
+        self.assertEqual([0], de.entries)
+        self.assertEqual(["de.a.json", "de.a.b.json"], [i.path.name for i in de.items])
+        self.assertEqual([1], news.entries)
+        self.assertEqual(["news.today.json"], [i.path.name for i in news.items])
+        self.assertEqual([], en.entries)
+
+
+class ParallelImportTestCase(unittest.TestCase):
+
+    # Commits for real, each test has its own storage
+    layer = CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        self.db = self.layer["zodbDB"]
+        self.site_path = "/".join(self.portal.getPhysicalPath())
+
+    def run_import(self, folder, **kwargs):
+        results = import_in_parallel(
+            lambda: self.db, self.site_path, folder, folder, **kwargs
+        )
+        # See the changes committed by the import
+        transaction.begin()
+        return results
+
+    def test_one_worker(self):
+        folder = os.path.join(os.path.dirname(__file__), "content")
+        results = self.run_import(folder, workers=1)
+        self.assertEqual(["/a-folder"], [result.root for result in results])
+        self.assertEqual("", results[0].error)
+        self.assertEqual(
+            ["a-document-1", "a-document-2", "a-document-3", "a-link"],
+            sorted(self.portal["a-folder"].objectIds())[:4],
+        )
+        # Site root, in the final phase
+        self.assertIn("d3f1c443-583f-4e8e-a682-3bf25752a300", self.portal.blocks)
+
+    def test_translations(self):
+        language_tool = getToolByName(self.portal, "portal_languages")
+        language_tool.addSupportedLanguage("de")
+        language_tool.addSupportedLanguage("en")
+        SetupMultilingualSite(self.portal).setupSite(self.portal)
+        enable_translatable_behavior(self.portal)
+        transaction.commit()
+
+        folder = os.path.join(os.path.dirname(__file__), "content_with_translations")
+        results = self.run_import(folder, workers=1)
+        self.assertEqual({"/de", "/en"}, {result.root for result in results})
+        de = self.portal["de"]["seite"]
+        en = self.portal["en"]["page"]
+        self.assertEqual(get_translation_manager(en).tg, get_translation_manager(de).tg)
+
+    def test_links_to_created_containers_are_refreshed(self):
+        content = [
+            {
+                "id": "linking",
+                "@type": "Document",
+                "title": "Linking",
+                "blocks": {"1": {"@type": "teaser", "href": [{"@id": "/container"}]}},
+                "blocks_layout": {"items": ["1"]},
+            }
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "content.json"), "w") as f:
+                json.dump(content, f)
+            # Its container is created for it, in another partition
+            with open(os.path.join(tmp, "container.document.json"), "w") as f:
+                json.dump({"@type": "Document", "title": "Document"}, f)
+            results = self.run_import(tmp, workers=1)
+        self.assertEqual(
+            [[], ["/plone/linking"]],
+            [result.linked_paths for result in sorted(results, key=lambda r: r.root)],
+        )
+        self.assertIn(
+            "resolveuid/{}".format(self.portal["container"].UID()),
+            json.dumps(self.portal["linking"].blocks),
+        )
+
+    def test_temp_enable_content_types(self):
+        disable_content_type(self.portal, "Document")
+        transaction.commit()
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "doc.json"), "w") as f:
+                json.dump({"@type": "Document", "title": "Document"}, f)
+            results = self.run_import(
+                tmp, workers=1, temp_enable_content_types=["Document"]
+            )
+        self.assertEqual("", results[0].error)
+        self.assertIn("doc", self.portal.objectIds())
+        self.assertFalse(self.portal.portal_types["Document"].global_allow)
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "Needs fork")
+class WorkerProcessesTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        # A ZEO server with a copy of the Zope application of the layer
+        address, stop = ZEO.server(
+            path=os.path.join(self.tmp, "Data.fs"),
+            blob_dir=os.path.join(self.tmp, "blobs"),
+        )
+        self.addCleanup(stop)
+        self.open_db = functools.partial(
+            ZEO.DB, address, blob_dir=os.path.join(self.tmp, "client-blobs")
+        )
+        app = self.layer["app"]
+        export = os.path.join(self.tmp, "app.zexp")
+        app._p_jar.exportFile(app._p_oid, export)
+        with self.open_root() as root:
+            root["Application"] = root._p_jar.importFile(export)
+            root._p_jar.transaction_manager.commit()
+        self.site_path = "/".join(self.layer["portal"].getPhysicalPath())
+
+    def db_factory(self):
+        db = self.open_db()
+        # The database of the calling process is left open by the import
+        self.addCleanup(db.close)
+        return db
+
+    @contextmanager
+    def open_root(self):
+        db = self.open_db()
+        connection = db.open(transaction.TransactionManager())
+        try:
+            yield connection.root()
+        finally:
+            connection.close()
+            db.close()
+
+    def test_worker_processes(self):
+        folder = os.path.join(self.tmp, "content")
+        os.mkdir(folder)
+        for id_ in ("de", "en"):
+            with open(os.path.join(folder, f"{id_}.json"), "w") as f:
+                json.dump({"@type": "Folder", "title": id_}, f)
+            with open(os.path.join(folder, f"{id_}.page.json"), "w") as f:
+                json.dump({"@type": "Document", "title": "Page"}, f)
+        results = import_in_parallel(
+            self.db_factory, self.site_path, folder, folder, workers=2
+        )
+        self.assertEqual(
+            [
+                ("/de", ["/plone/de", "/plone/de/page"], ""),
+                ("/en", ["/plone/en", "/plone/en/page"], ""),
+            ],
+            sorted((r.root, r.paths, r.error) for r in results),
+        )
+        # The commits of the workers are in the storage
+        with self.open_root() as root:
+            portal = root["Application"].unrestrictedTraverse(self.site_path)
+            for id_ in ("de", "en"):
+                self.assertEqual(id_, portal[id_].title)
+                self.assertEqual("Page", portal[id_]["page"].title)
@@ -0,0 +1,158 @@
+from DateTime import DateTime
+from kitconcept import api
+from kitconcept.contentcreator.creator import content_creator_from_folder
+from kitconcept.contentcreator.creator import create_item_runner
+from kitconcept.contentcreator.manifest import ANNOTATION_KEY
+from kitconcept.contentcreator.plan import plan_structure
+from kitconcept.contentcreator.scales import get_scale_infos
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from zope.annotation.interfaces import IAnnotations
+
+import json
+import os
+import tempfile
+import unittest
+
+
+class PlanTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        self.path = os.path.join(os.path.dirname(__file__), "content")
+
+    def test_dry_run(self):
+        with api.env.adopt_roles(["Manager"]):
+            report = content_creator_from_folder(folder_name=self.path, dry_run=True)
+        self.assertNotIn("a-folder", self.portal.objectIds())
+        summary = report["summary"]
+        self.assertEqual(6, summary["create"])
+        self.assertEqual(1, summary["edit"])  # the site root
+        self.assertEqual(0, summary["skip"])
+        self.assertEqual([], summary["missing_containers"])
+        self.assertIn(
+            {
+                "path": "/a-folder/a-document-1",
+                "action": "create",
+                "portal_type": "Document",
+                "images": 0,
+                "reason": "",
+            },
+            report["actions"],
+        )
+
+    def test_dry_run_existing_content(self):
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=self.path)
+            report = content_creator_from_folder(folder_name=self.path, dry_run=True)
+        self.assertEqual(0, report["summary"]["create"])
+        self.assertEqual(7, report["summary"]["edit"])
+
+    def test_incremental_dry_run_writes_nothing(self):
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(
+                folder_name=self.path, incremental=True, dry_run=True
+            )
+        self.assertNotIn(ANNOTATION_KEY, IAnnotations(self.portal))
+
+    def test_incremental_dry_run_skips_like_the_import(self):
+        with api.env.adopt_roles(["Manager"]):
+            content_creator_from_folder(folder_name=self.path, incremental=True)
+            report = content_creator_from_folder(
+                folder_name=self.path, incremental=True, dry_run=True
+            )
+        self.assertEqual(0, report["summary"]["create"])
+        self.assertEqual(0, report["summary"]["edit"])
+        self.assertEqual(
+            {"unchanged"}, {action["reason"] for action in report["actions"]}
+        )
+        self.assertIn("/", [action["path"] for action in report["actions"]])
+
+    def test_files_which_can_not_be_loaded_are_skipped(self):
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "README.txt"), "w") as f:
+                f.write("Not JSON")
+            with api.env.adopt_roles(["Manager"]):
+                report = content_creator_from_folder(
+                    folder_name=path, dry_run=True, fail_on_load_errors=True
+                )
+        self.assertEqual(
+            [
+                {
+                    "path": "/README",
+                    "action": "skip",
+                    "portal_type": None,
+                    "images": 0,
+                    "reason": "could not be loaded",
+                }
+            ],
+            report["actions"],
+        )
+
+    def test_missing_containers_and_translations(self):
+        path = os.path.join(os.path.dirname(__file__), "content_with_translations")
+        with tempfile.TemporaryDirectory() as tmp:
+            plan_path = os.path.join(tmp, "plan.json")
+            with api.env.adopt_roles(["Manager"]):
+                report = content_creator_from_folder(
+                    folder_name=path, plan_path=plan_path
+                )
+            with open(plan_path) as f:
+                self.assertEqual(report, json.load(f))
+        self.assertNotIn("de", self.portal.objectIds())
+        summary = report["summary"]
+        self.assertEqual(["/de", "/en"], summary["missing_containers"])
+        self.assertEqual(4, summary["create"])
+        self.assertEqual(1, summary["link"])
+
+    def test_modified_children_are_planned_like_the_runner(self):
+        structure = [
+            {
+                "@type": "Folder",
+                "id": "parent",
+                "title": "Parent",
+                "items": [{"@type": "Document", "id": "child", "title": "Changed"}],
+            }
+        ]
+        options = dict(do_not_edit_if_modified_after="2000-01-01")
+        with api.env.adopt_roles(["Manager"]):
+            parent = api.content.create(self.portal, type="Folder", id="parent")
+            api.content.create(parent, type="Document", id="child", title="Child")
+            # Only the items the runner is called with are checked
+            parent.modification_date = DateTime("1999-01-01")
+            plan = plan_structure(self.portal, structure, **options)
+            create_item_runner(self.portal, structure, **options)
+        self.assertEqual(
+            [("/parent", "edit"), ("/parent/child", "edit")],
+            [(action.path, action.action) for action in plan.actions],
+        )
+        self.assertEqual("Changed", parent["child"].title)
+        plan = plan_structure(parent, structure[0]["items"], **options)
+        self.assertEqual(["skip"], [action.action for action in plan.actions])
+
+    def test_plan_structure(self):
+        plan = plan_structure(
+            self.portal,
+            [
+                {
+                    "@type": "Folder",
+                    "id": "images",
+                    "items": [
+                        {"@type": "Image", "id": "a", "set_dummy_image": ["image"]},
+                        {"id": "no-type"},
+                    ],
+                },
+                {"@type": "Document", "id": "front-page"},
+            ],
+        )
+        summary = plan.summary()
+        self.assertEqual(2, summary["create"])
+        self.assertEqual(1, summary["edit"])
+        self.assertEqual(1, summary["skip"])
+        self.assertEqual(1, summary["images"])
+        self.assertEqual(len(get_scale_infos()) + 1, summary["scales"])
+        self.assertEqual(
+            ["/images", "/images/a", "/images/no-type", "/front-page"],
+            [action.path for action in plan.actions],
+        )
@@ -0,0 +1,99 @@
+from kitconcept.contentcreator.preload import LoadError
+from kitconcept.contentcreator.preload import preload
+from kitconcept.contentcreator.preload import validate_structure
+from unittest import mock
+
+import json
+import os
+import pathlib
+import tempfile
+import unittest
+
+
+IMAGES = os.path.dirname(__file__)
+
+
+class PreloadTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.folder = pathlib.Path(tmp.name)
+
+    def write(self, name, data):
+        path = self.folder / name
+        path.write_text(data if isinstance(data, str) else json.dumps(data))
+        return path
+
+    def test_valid_files(self):
+        paths = [
+            self.write("de.json", {"@type": "LRF"}),
+            self.write(
+                "de.bild.json",
+                {"@type": "Image", "id": "bild", "set_local_image": "image.png"},
+            ),
+        ]
+        report = preload(paths, IMAGES, workers=1)
+        self.assertEqual({}, report.errors)
+        self.assertEqual(["/de", "/de/bild"], [i.plone_path for i in report.items])
+
+    def test_errors(self):
+        paths = [
+            self.write("bad.json", "{"),
+            self.write("de..page.json", {"@type": "Document"}),
+            self.write("de.page.json", {"@type": "Document", "id": "a/b"}),
+            self.write("de.folder.json", {"@type": "Folder", "items": [{"id": "x"}]}),
+            self.write(
+                "de.image.json", {"@type": "Image", "set_local_image": "missing.png"}
+            ),
+            self.write("de.ok.json", {"@type": "Document"}),
+        ]
+        report = preload(paths, IMAGES, workers=1)
+        self.assertEqual(["/de/ok"], [item.plone_path for item in report.items])
+        self.assertEqual(set(paths[:-1]), set(report.errors))
+        self.assertEqual(
+            ["empty segment in the dotted filename"], report.errors[paths[1]]
+        )
+        self.assertEqual(
+            ["/de/folder/x: property '@type' is required"], report.errors[paths[3]]
+        )
+        self.assertEqual(
+            ["/de/image: set_local_image file not found: missing.png"],
+            report.errors[paths[4]],
+        )
+
+    def test_errors_are_skipped(self):
+        paths = [self.write("bad.json", "{"), self.write("de.json", {"@type": "LRF"})]
+        report = preload(paths, IMAGES, workers=1)
+        logger = mock.Mock()
+        report.log(logger)
+        logger.error.assert_called_once()
+        logger.warning.assert_called_once_with(
+            "1 of 2 files could not be loaded, skipped"
+        )
+        with self.assertRaises(LoadError):
+            report.log(logger, strict=True)
+
+    def test_workers(self):
+        paths = [
+            self.write(f"de.page-{index}.json", {"@type": "Document"})
+            for index in range(10)
+        ]
+        paths.append(self.write("bad.json", "["))
+        serial = preload(paths, IMAGES, workers=1)
+        parallel = preload(paths, IMAGES, workers=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(10, len(parallel.items))
+
+    def test_validate_fields(self):
+        data = {
+            "@type": "Document",
+            "set_local_file": {"file": "report.pdf", "other": "missing.pdf"},
+            "items": "not a list",
+        }
+        self.assertEqual(
+            [
+                "/page: set_local_file file not found: missing.pdf",
+                "/page: 'items' must be a list",
+            ],
+            validate_structure(data, IMAGES, "/page"),
+        )
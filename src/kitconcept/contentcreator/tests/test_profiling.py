@@ -0,0 +1,79 @@
+from kitconcept import api
+from kitconcept.contentcreator.creator import content_creator_from_folder
+from kitconcept.contentcreator.profiling import profile_phase
+from kitconcept.contentcreator.profiling import Profiler
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from unittest import mock
+
+import os
+import pstats
+import tempfile
+import unittest
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = os.path.join(tmp.name, "profile")
+
+    def test_phases(self):
+        with Profiler(self.directory).activate():
+            with profile_phase("load"):
+                sorted(range(1000))
+                # Nested phases are part of the outer one
+                with profile_phase("nested"):
+                    pass
+            with profile_phase("items"):
+                pass
+        self.assertEqual(
+            ["01-load.pstats", "02-items.pstats", "import.pstats"],
+            sorted(os.listdir(self.directory)),
+        )
+        stats = pstats.Stats(os.path.join(self.directory, "import.pstats"))
+        self.assertTrue(stats.total_calls > 0)
+
+    def test_memory(self):
+        with Profiler(self.directory, memory=True).activate():
+            with profile_phase("load"):
+                data = [str(i) for i in range(1000)]  # noqa: F841
+        with open(os.path.join(self.directory, "01-load.memory.txt")) as f:
+            self.assertIn("Traced memory", f.read())
+
+    def test_inactive(self):
+        with profile_phase("load"):
+            pass
+        self.assertFalse(os.path.exists(self.directory))
+
+
+class ImportProfileTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+
+    def test_all_phases_are_profiled(self):
+        path = os.path.join(os.path.dirname(__file__), "content")
+        with mock.patch("kitconcept.contentcreator.profiling.PROFILE", self.directory):
+            with api.env.adopt_roles(["Manager"]):
+                content_creator_from_folder(folder_name=path)
+        (run,) = os.listdir(self.directory)
+        phases = [
+            name.split("-", 1)[1]
+            for name in sorted(os.listdir(os.path.join(self.directory, run)))
+            if name != "import.pstats"
+        ]
+        self.assertEqual(
+            [
+                "load.pstats",
+                "prescan.pstats",
+                "content.pstats",
+                "items.pstats",
+                "refresh.pstats",
+                "scales.pstats",
+            ],
+            phases,
+        )
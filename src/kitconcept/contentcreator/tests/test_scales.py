@@ -0,0 +1,111 @@
+from kitconcept import api
+from kitconcept.contentcreator.creator import create_item_runner
+from kitconcept.contentcreator.creator import load_json
+from kitconcept.contentcreator.scales import render_scales
+from kitconcept.contentcreator.scales import ScaleQueue
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+from plone.scale.storage import AnnotationStorage
+from unittest import mock
+from zope.annotation.interfaces import IAnnotations
+
+import os
+import unittest
+
+
+class ScaleQueueTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        # Other tests may have committed content to the portal
+        with api.env.adopt_roles(["Manager"]):
+            self.folder = api.content.create(self.portal, type="Folder", id="scales")
+
+    def rendered_scales(self, obj):
+        scales = IAnnotations(obj).get("plone.scale", {})
+        return [info for info in scales.values() if info.get("data") is not None]
+
+    def test_queue_is_disabled_by_skip_scales(self):
+        with mock.patch.dict(os.environ, {"CREATOR_SKIP_SCALES": "1"}):
+            queue = ScaleQueue()
+        queue.enqueue(self.portal, "image")
+        self.assertEqual(0, len(queue))
+
+    def test_scales_are_generated_after_creation(self):
+        content_structure = load_json("fields_image.json", __file__)
+        queue = ScaleQueue(batch_size=2)
+
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.folder,
+                content_structure,
+                default_lang="en",
+                default_wf_state="published",
+                base_image_path=os.path.dirname(__file__),
+                scale_queue=queue,
+            )
+            # Plone 6 registers the scales of the catalog metadata without
+            # rendering them
+            self.assertEqual([], self.rendered_scales(self.folder["another-image"]))
+            self.assertTrue(len(queue))
+
+            queue.process()
+
+        self.assertEqual(0, len(queue))
+        self.assertTrue(self.rendered_scales(self.folder["another-image"]))
+
+    def test_render_scales(self):
+        with open(os.path.join(os.path.dirname(__file__), "image.png"), "rb") as f:
+            data = f.read()
+        scales = render_scales(data, [("thumb", 128, 128, "thumbnail")])
+        name, width, height, direction, (scale, format_, dimensions) = scales[0]
+        self.assertEqual("thumb", name)
+        self.assertEqual("PNG", format_)
+        self.assertLessEqual(max(dimensions), 128)
+        self.assertTrue(scale)
+
+    def test_scales_are_rendered_in_a_process_pool(self):
+        content_structure = load_json("fields_image.json", __file__)
+        queue = ScaleQueue(workers=2)
+
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.folder,
+                content_structure,
+                default_lang="en",
+                default_wf_state="published",
+                base_image_path=os.path.dirname(__file__),
+                scale_queue=queue,
+            )
+            queue.process()
+
+        scales = IAnnotations(self.folder["another-image"])["plone.scale"]
+        self.assertTrue(
+            any(info["width"] <= 128 for info in scales.values()),
+        )
+
+    def test_images_view_finds_the_scales_of_the_process_pool(self):
+        content_structure = load_json("fields_image.json", __file__)
+        queue = ScaleQueue(workers=2)
+
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.folder,
+                content_structure,
+                default_lang="en",
+                default_wf_state="published",
+                base_image_path=os.path.dirname(__file__),
+                scale_queue=queue,
+            )
+            queue.process()
+
+        obj = self.folder["another-image"]
+        stored = [
+            info for info in self.rendered_scales(obj) if info.get("scale") == "thumb"
+        ]
+        self.assertEqual(1, len(stored))
+        with mock.patch.object(AnnotationStorage, "generate_scale") as generate:
+            scale = obj.restrictedTraverse("@@images").scale("image", scale="thumb")
+        generate.assert_not_called()
+        self.assertEqual(stored[0]["uid"], scale.uid)
@@ -0,0 +1,76 @@
+from kitconcept.contentcreator.scheduler import Item
+from kitconcept.contentcreator.scheduler import schedule
+
+import pathlib
+import unittest
+
+
+def make_item(filename, **structure):
+    return Item(pathlib.Path("/tmp/content") / filename, structure)
+
+
+def names(unit):
+    return [item.path.name for item in unit.items]
+
+
+class ScheduleTestCase(unittest.TestCase):
+    def test_item_paths(self):
+        item = make_item("de.beispiele.bilder.json")
+        self.assertEqual("/de/beispiele", item.container_path)
+        self.assertEqual("/de/beispiele/bilder", item.plone_path)
+        item = make_item("de.json", id="deutsch")
+        self.assertEqual("/", item.container_path)
+        self.assertEqual("/deutsch", item.plone_path)
+
+    def test_parents_before_children(self):
+        items = [
+            make_item("de.a.b.c.json"),
+            make_item("de.a.json"),
+            make_item("de.json"),
+            make_item("de.a.b.json"),
+        ]
+        (unit,) = schedule(items)
+        self.assertEqual(
+            ["de.json", "de.a.json", "de.a.b.json", "de.a.b.c.json"], names(unit)
+        )
+
+    def test_independent_subtrees_are_separate_units(self):
+        items = [
+            make_item("en.page.json"),
+            make_item("de.seite.json"),
+            make_item("de.json"),
+            make_item("en.json"),
+        ]
+        units = schedule(items)
+        self.assertEqual(["/de", "/en"], [unit.root for unit in units])
+        self.assertEqual(["de.json", "de.seite.json"], names(units[0]))
+        self.assertEqual(["en.json", "en.page.json"], names(units[1]))
+
+    def test_missing_intermediate_parent(self):
+        # de.a.json does not exist, de.a.b.json depends on de.json
+        items = [make_item("de.a.b.json"), make_item("de.json")]
+        (unit,) = schedule(items)
+        self.assertEqual(["de.json", "de.a.b.json"], names(unit))
+
+    def test_custom_and_types_order(self):
+        items = [
+            make_item("a-folder.a.json", **{"@type": "Document"}),
+            make_item("a-folder.b.json", **{"@type": "Link"}),
+            make_item("a-folder.c.json", **{"@type": "Document"}),
+        ]
+        (unit,) = schedule(items, types_order=["Link"])
+        self.assertEqual(
+            ["a-folder.b.json", "a-folder.a.json", "a-folder.c.json"], names(unit)
+        )
+        (unit,) = schedule(items, custom_order=["a-folder.c.json"])
+        self.assertEqual(
+            ["a-folder.c.json", "a-folder.a.json", "a-folder.b.json"], names(unit)
+        )
+
+    def test_id_from_json_wins(self):
+        items = [
+            make_item("de.json", id="deutsch"),
+            make_item("deutsch.seite.json"),
+        ]
+        (unit,) = schedule(items)
+        self.assertEqual(["de.json", "deutsch.seite.json"], names(unit))
@@ -0,0 +1,62 @@
+from kitconcept import api
+from kitconcept.contentcreator.creator import content_creator_from_folder
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from kitconcept.contentcreator.timing import measure
+from kitconcept.contentcreator.timing import Timings
+
+import json
+import os
+import tempfile
+import unittest
+
+
+class TimingsTestCase(unittest.TestCase):
+    def test_report(self):
+        timings = Timings()
+        with timings.activate():
+            with measure("deserialize", "Document"):
+                pass
+            with measure("deserialize", "Document"):
+                pass
+            with measure("deserialize", "Folder"):
+                pass
+            with measure("commit"):
+                pass
+        report = timings.report()
+        self.assertEqual(3, report["phases"]["deserialize"]["count"])
+        self.assertEqual(
+            2, report["phases"]["deserialize"]["types"]["Document"]["count"]
+        )
+        self.assertEqual({}, report["phases"]["commit"]["types"])
+        self.assertTrue(report["wall"] >= report["phases"]["deserialize"]["wall"])
+
+    def test_inactive(self):
+        timings = Timings()
+        with measure("deserialize", "Document"):
+            pass
+        self.assertEqual({}, timings.report()["phases"])
+
+
+class ContentCreatorTimingsTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.path = os.path.join(os.path.dirname(__file__), "content")
+
+    def test_no_report_by_default(self):
+        with api.env.adopt_roles(["Manager"]):
+            self.assertIsNone(content_creator_from_folder(folder_name=self.path))
+
+    def test_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            timings_path = os.path.join(tmp, "timings.json")
+            with api.env.adopt_roles(["Manager"]):
+                report = content_creator_from_folder(
+                    folder_name=self.path, timings_path=timings_path
+                )
+            with open(timings_path) as f:
+                self.assertEqual(report, json.load(f))
+        self.assertIn("Document", report["phases"]["deserialize"]["types"])
+        self.assertIn("add", report["phases"])
+        self.assertIn("prescan", report["phases"])
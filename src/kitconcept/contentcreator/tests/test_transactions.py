@@ -0,0 +1,81 @@
+from kitconcept import api
+from kitconcept.contentcreator.creator import create_item_runner
+from kitconcept.contentcreator.creator import load_json
+from kitconcept.contentcreator.testing import CONTENTCREATOR_CORE_INTEGRATION_TESTING
+from kitconcept.contentcreator.transactions import CommitPolicy
+from kitconcept.contentcreator.transactions import Committer
+from unittest import mock
+from ZODB.POSException import ConflictError
+
+import unittest
+
+
+class CommitterTestCase(unittest.TestCase):
+
+    layer = CONTENTCREATOR_CORE_INTEGRATION_TESTING
+
+    def setUp(self):
+        self.portal = self.layer["portal"]
+        patcher = mock.patch("kitconcept.contentcreator.transactions.transaction")
+        self.transaction = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_commit_every_n_objects(self):
+        committer = Committer(CommitPolicy(objects=2))
+        for i in range(5):
+            committer.add(self.portal)
+        self.assertEqual(2, committer.commits)
+        self.assertEqual(1, committer.objects)
+
+    def test_commit_every_n_bytes(self):
+        committer = Committer(CommitPolicy(blob_bytes=1000))
+        committer.add(self.portal, 600)
+        self.assertEqual(0, committer.commits)
+        committer.add(self.portal, 600)
+        self.assertEqual(1, committer.commits)
+
+    def test_savepoint_between_commits(self):
+        committer = Committer(CommitPolicy(objects=10, savepoint_objects=3))
+        for i in range(7):
+            committer.add(self.portal)
+        self.assertEqual(0, committer.commits)
+        self.assertEqual(2, self.transaction.savepoint.call_count)
+
+    def test_retry_on_conflict_error(self):
+        committer = Committer(CommitPolicy(subtree=True, retries=2))
+        calls = []
+
+        def unit():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConflictError()
+
+        committer.run(unit, description="/unit")
+        self.assertEqual(3, len(calls))
+        self.assertEqual(2, self.transaction.abort.call_count)
+        self.assertEqual(1, committer.commits)
+
+    def test_give_up_after_retries(self):
+        committer = Committer(CommitPolicy(retries=1))
+
+        def unit():
+            raise ConflictError()
+
+        with self.assertRaises(ConflictError):
+            committer.run(unit, description="/unit")
+
+    def test_runner_commits_every_top_level_item(self):
+        content_structure = load_json("test_content.json", __file__)
+
+        with api.env.adopt_roles(["Manager"]):
+            create_item_runner(
+                self.portal,
+                content_structure,
+                default_lang="en",
+                default_wf_state="published",
+                commit_policy=CommitPolicy(subtree=True),
+            )
+
+        self.assertIn("a-folder", self.portal.objectIds())
+        # One commit per top-level item and a final one
+        self.assertEqual(3, self.transaction.get().commit.call_count)
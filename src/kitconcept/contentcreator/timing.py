@@ -0,0 +1,103 @@
+"""Timing of the phases of an import run."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import json
+import pathlib
+import time
+
+
+_timings: ContextVar = ContextVar("kitconcept.contentcreator.timings", default=None)
+
+
+class Timings:
+    """Wall and CPU time spent in each phase of an import run.
+
+    Times are recorded by :func:`measure` while the timings are active (see
+    :meth:`activate`), per phase and per portal type. Phases can be nested
+    (e.g. ``commit`` includes the catalog indexing done by Plone), so their
+    times don't add up to the total.
+
+    CPU time is the one of the importing process: the time spent in the
+    workers of ``CREATOR_SCALE_WORKERS`` is not included.
+    """
+
+    def __init__(self):
+        # (phase, portal_type) -> [count, wall, cpu]
+        self._totals: Dict[Tuple[str, Optional[str]], List[float]] = {}
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    @contextmanager
+    def activate(self):
+        """Record the phases measured in the block and its total time."""
+        token = _timings.set(self)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield self
+        finally:
+            self.wall += time.perf_counter() - wall
+            self.cpu += time.process_time() - cpu
+            _timings.reset(token)
+
+    def add(self, phase: str, portal_type: Optional[str], wall: float, cpu: float):
+        totals = self._totals.setdefault((phase, portal_type), [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += wall
+        totals[2] += cpu
+
+    def report(self) -> dict:
+        """Return the times as a JSON serializable mapping.
+
+        ``{"wall": .., "cpu": .., "phases": {"deserialize": {"count": ..,
+        "wall": .., "cpu": .., "types": {"Document": {..}}}}}``
+        """
+        phases: Dict[str, dict] = {}
+        for (phase, portal_type), (count, wall, cpu) in sorted(
+            self._totals.items(), key=lambda item: (item[0][0], item[0][1] or "")
+        ):
+            entry = phases.setdefault(
+                phase, {"count": 0, "wall": 0.0, "cpu": 0.0, "types": {}}
+            )
+            entry["count"] += count
+            entry["wall"] = round(entry["wall"] + wall, 6)
+            entry["cpu"] = round(entry["cpu"] + cpu, 6)
+            if portal_type is not None:
+                entry["types"][portal_type] = {
+                    "count": count,
+                    "wall": round(wall, 6),
+                    "cpu": round(cpu, 6),
+                }
+        return {
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "phases": phases,
+        }
+
+    def write(self, path):
+        """Write the report as JSON to ``path``."""
+        with pathlib.Path(path).open("w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+@contextmanager
+def measure(phase: str, portal_type: Optional[str] = None):
+    """Measure the block as ``phase`` if timings are active, else do nothing."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        timings.add(
+            phase,
+            portal_type,
+            time.perf_counter() - wall,
+            time.process_time() - cpu,
+        )
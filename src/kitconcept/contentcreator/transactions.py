@@ -0,0 +1,183 @@
+"""Transaction handling for long running imports."""
+from .timing import measure
+from .utils import logger
+from dataclasses import dataclass
+from ZODB.POSException import ConflictError
+
+import transaction
+
+
+@dataclass
+class CommitPolicy:
+    """When to commit the transaction while creating content.
+
+    :param objects: Commit after this many objects were created or edited.
+                    ``0`` disables this threshold.
+    :type objects: int
+    :param blob_bytes: Commit after this many bytes of blob data (images and
+                       files) were added. ``0`` disables this threshold.
+    :type blob_bytes: int
+    :param subtree: Commit after each top-level item, that is, after each
+                    standalone JSON file or each entry of a content structure
+                    list together with all its children.
+    :type subtree: bool
+    :param savepoint_objects: Between commits, take an optimistic savepoint
+                              after this many objects, so the ZODB cache can
+                              be shrunk. ``0`` disables savepoints.
+    :type savepoint_objects: int
+    :param retries: How often a top-level item is retried after a
+                    ``ConflictError``.
+    :type retries: int
+    """
+
+    objects: int = 0
+    blob_bytes: int = 0
+    subtree: bool = False
+    savepoint_objects: int = 100
+    retries: int = 3
+
+
+class Committer:
+    """Apply a :class:`CommitPolicy` during one import run.
+
+    Objects are reported with :meth:`add`, which commits or takes a savepoint
+    whenever a threshold of the policy is reached. Top-level items are run
+    with :meth:`run`, which retries them after a ``ConflictError``. Creating
+    content is idempotent (existing objects are edited), so running an item
+    again after some of its children have already been committed is safe.
+    """
+
+    def __init__(self, policy: CommitPolicy):
+        self.policy = policy
+        self.commits = 0
+        self.running = False
+        self._reset()
+
+    def _reset(self):
+        self.objects = 0
+        self.blob_bytes = 0
+        self.since_savepoint = 0
+
+    def add(self, obj, blob_bytes: int = 0):
+        """Account for a created or edited object."""
+        self.objects += 1
+        self.blob_bytes += blob_bytes
+        self.since_savepoint += 1
+
+        policy = self.policy
+        if (policy.objects and self.objects >= policy.objects) or (
+            policy.blob_bytes and self.blob_bytes >= policy.blob_bytes
+        ):
+            self.commit("/".join(obj.getPhysicalPath()))
+        elif policy.savepoint_objects and self.since_savepoint >= (
+            policy.savepoint_objects
+        ):
+            self.savepoint(obj)
+
+    def savepoint(self, obj=None):
+        """Take an optimistic savepoint and shrink the ZODB cache."""
+        with measure("savepoint"):
+            transaction.savepoint(optimistic=True)
+            jar = getattr(obj, "_p_jar", None)
+            if jar is not None:
+                jar.cacheGC()
+        self.since_savepoint = 0
+
+    def commit(self, note: str = ""):
+        """Commit the current transaction."""
+        txn = transaction.get()
+        if note:
+            txn.note(note)
+        with measure("commit"):
+            txn.commit()
+        self.commits += 1
+        logger.debug(
+            "Committed transaction {} ({} objects, {} bytes)".format(
+                self.commits, self.objects, self.blob_bytes
+            )
+        )
+        self._reset()
+
+    def abort(self):
+        transaction.abort()
+        self._reset()
+
+    def run(self, func, *args, description: str = "", **kwargs):
+        """Run a top-level item and retry it on ``ConflictError``.
+
+        Nested calls (e.g. the recursion of the runner) join the item that is
+        already running.
+        """
+        if self.running:
+            return func(*args, **kwargs)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            self.running = True
+            try:
+                result = func(*args, **kwargs)
+                if self.policy.subtree:
+                    self.commit(description)
+                return result
+            except ConflictError:
+                self.abort()
+                if attempt > self.policy.retries:
+                    logger.error(
+                        f"{description} - ConflictError, giving up after "
+                        f"{attempt} attempts"
+                    )
+                    raise
+                logger.warning(f"{description} - ConflictError, retrying")
+            finally:
+                self.running = False
+
+
+class TransactionalCache:
+    """Mapping for persistent objects created during an import run.
+
+    Entries added in a transaction only become permanent once it has been
+    committed. If the transaction is aborted (e.g. to retry after a
+    ``ConflictError``), they are dropped, because the objects they refer to
+    have never been stored.
+    """
+
+    def __init__(self):
+        self._committed = {}
+        self._pending = {}
+        self._txn = None
+
+    def _join(self):
+        txn = transaction.get()
+        if txn is not self._txn:
+            # The previous transaction was aborted, its hook never ran
+            self._pending = {}
+            self._txn = txn
+            txn.addAfterCommitHook(self._after_commit)
+
+    def _after_commit(self, success):
+        if success:
+            self._committed.update(self._pending)
+        self._pending = {}
+
+    def get(self, key, default=None):
+        self._join()
+        if key in self._pending:
+            return self._pending[key]
+        return self._committed.get(key, default)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __setitem__(self, key, value):
+        self._join()
+        self._pending[key] = value
+
+    def pop(self, key, default=None):
+        self._join()
+        value = self._pending.pop(key, default)
+        return self._committed.pop(key, value)
+
+    def clear(self):
+        self._committed = {}
+        self._pending = {}
@@ -16,7 +16,7 @@ class TranslationError(Exception):
     pass
 
 
-def link_translations(translation_map: pathlib.Path):
+def link_translations(translation_map: pathlib.Path, lookup=None):
     if get_translation_manager is None:
         logger.warn(
             "Content includes translations but plone.app.multilingual is not installed"
@@ -28,18 +28,19 @@ def link_translations(translation_map: pathlib.Path):
         next(reader)  # skip header
         for lineno, (canonical_path, translation_path) in reader:
             try:
-                link_translation(canonical_path, translation_path)
+                link_translation(canonical_path, translation_path, lookup=lookup)
             except TranslationError as e:
                 handle_error(f"{translation_map.name} line {lineno}: {e}")
 
 
-def link_translation(canonical_path: str, translation_path: str):
-    canonical = api.content.get(canonical_path)
+def link_translation(canonical_path: str, translation_path: str, lookup=None):
+    get = lookup.get if lookup is not None else api.content.get
+    canonical = get(canonical_path)
     if canonical is None:
         raise TranslationError(f"Canonical path not found: {canonical_path}")
     if not canonical.language:
         raise TranslationError(f"{canonical_path} has unknown language")
-    translation = api.content.get(translation_path)
+    translation = get(translation_path)
     if translation is None:
         raise TranslationError(f"Translation path not found: {translation_path}")
     if not translation.language:
@@ -41,6 +41,8 @@ logger.addHandler(ch)
 
 DEBUG = os.environ.get("CREATOR_DEBUG")
 CONTINUE_ON_ERROR = os.environ.get("CREATOR_CONTINUE_ON_ERROR")
+PROFILE = os.environ.get("CREATOR_PROFILE")
+PROFILE_MEMORY = os.environ.get("CREATOR_PROFILE_MEMORY")
 
 
 def handle_error(msg: str):